@@ -13,8 +13,14 @@ from logging_config import setup_logging
 from handlers.notification import send_event_reminders
 from database.engine import Session, create_db, drop_db
 from logic.scrap_control import scrap_everything
+from logic.outbox import outbox_dispatcher
+from logic.browser_pool import browser_pool
+from logic.user_activity import last_seen
+from logic.helper import text_store
 from middlewares.db import DataBaseSession
-from filter.filter import get_admins_ids
+from filter.filter import get_admins_ids, role_cache
+from logic.studio_categories import studio_categories
+from replyes.menus import keyboards
 from logic.cmd_list import private
 
 # Роутеры
@@ -120,11 +126,23 @@ async def on_startup(bot: Bot):
     if run_param:
         await drop_db()
     await create_db()
+    async with Session() as session:
+        await role_cache.load(session)
+        await studio_categories.load(session)
+    await text_store.load()
+    text_store.start()
+    keyboards.warm_up()
+    outbox_dispatcher.start(bot)
+    last_seen.start()
     logger.info("🚀 Бот запущен и БД инициализирована")
 
 
 async def on_shutdown(bot: Bot):
     """Действия при остановке бота."""
+    await outbox_dispatcher.stop()
+    await last_seen.stop()
+    await text_store.stop()
+    await asyncio.to_thread(browser_pool.shutdown)
     logger.info("🛑 Бот остановлен")
 
 
@@ -3,26 +3,83 @@ import logging
 import subprocess
 import sys
 
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from database.models import Base
+from database.migrations import run_migrations
 
 # ================= ЛОГИРОВАНИЕ =================
 
 logger = logging.getLogger(__name__)
 
+# ================= НАСТРОЙКИ =================
+
+# PRAGMA, которые применяются к каждому новому соединению SQLite.
+# WAL: чтение не блокируется, пока парсер пишет; при WAL synchronous=NORMAL
+# не теряет целостность, а fsync делается только на checkpoint.
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_CACHE_SIZE_MB = int(os.getenv("SQLITE_CACHE_SIZE_MB", "64"))    # кэш страниц на соединение
+SQLITE_MMAP_SIZE_MB = int(os.getenv("SQLITE_MMAP_SIZE_MB", "256"))     # 0 — без mmap
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))  # ждать писателя вместо "database is locked"
+
+# Пул: читатели работают параллельно, писатель в SQLite всегда один —
+# остальные ждут его busy_timeout, поэтому большой пул не нужен.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "5"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))  # секунд ждать свободное соединение
+
 # ================= ДВИЖОК =================
 DB_URL = os.getenv("DB_LITE")
 if not DB_URL:
     logger.critical("❌ Не задана переменная окружения DB_LITE")
     raise RuntimeError("Отсутствует DB_LITE в .env")
 
+url = make_url(DB_URL)
+is_sqlite = url.get_backend_name() == "sqlite"
+in_memory = is_sqlite and url.database in (None, "", ":memory:")
+
+# у SQLite в памяти один общий коннект (StaticPool), размер пула не задаётся
+pool_options = {} if in_memory else {
+    "pool_size": DB_POOL_SIZE,
+    "max_overflow": DB_MAX_OVERFLOW,
+    "pool_timeout": DB_POOL_TIMEOUT,
+}
+
 # Создаём асинхронный движок SQLAlchemy
 engine = create_async_engine(
     DB_URL,
     echo=False,   # echo=True — для отладки SQL-запросов
-    future=True
+    future=True,
+    **pool_options,
 )
 
+
+def sqlite_pragmas() -> list[str]:
+    pragmas = [
+        f"PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT_MS}",
+        f"PRAGMA synchronous = {SQLITE_SYNCHRONOUS}",
+        f"PRAGMA cache_size = -{SQLITE_CACHE_SIZE_MB * 1024}",  # отрицательное значение — в КиБ
+        "PRAGMA temp_store = MEMORY",
+    ]
+    if not in_memory:
+        pragmas.insert(0, f"PRAGMA journal_mode = {SQLITE_JOURNAL_MODE}")
+        pragmas.append(f"PRAGMA mmap_size = {SQLITE_MMAP_SIZE_MB * 1024 * 1024}")
+    return pragmas
+
+
+if is_sqlite:
+    @event.listens_for(engine.sync_engine, "connect")
+    def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in sqlite_pragmas():
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
 # Фабрика асинхронных сессий
 Session = async_sessionmaker(
     bind=engine,
@@ -37,7 +94,14 @@ async def create_db() -> None:
     try:
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(run_migrations)
         logger.info("📦 Таблицы успешно созданы (или уже существуют)")
+        if is_sqlite:
+            logger.info(
+                f"SQLite: journal_mode={SQLITE_JOURNAL_MODE}, synchronous={SQLITE_SYNCHRONOUS}, "
+                f"cache={SQLITE_CACHE_SIZE_MB} МБ, mmap={SQLITE_MMAP_SIZE_MB} МБ, "
+                f"busy_timeout={SQLITE_BUSY_TIMEOUT_MS} мс, пул={pool_options or 'StaticPool'}"
+            )
     except Exception as e:
         logger.error(f"Ошибка при создании БД: {e}", exc_info=True)
         raise
@@ -0,0 +1,82 @@
+# explain_check.py
+"""
+Проверка, что списки и поиск по названию идут по индексам.
+
+Для каждого горячего запроса бота выполняется EXPLAIN QUERY PLAN;
+если SQLite собирается читать таблицу целиком (SCAN без индекса),
+запрос считается проблемным и скрипт завершается с кодом 1.
+
+Использование: python database/explain_check.py
+"""
+import os
+import sys
+import logging
+from datetime import date
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, select, desc, func
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database.models import News, Events, Studios, UserEventTracking, Admin  # noqa: E402
+
+# Загружаем переменные окружения
+load_dotenv()
+DB_URL = os.getenv("DB_LITE")
+if not DB_URL:
+    raise RuntimeError("Отсутствует DB_LITE в .env")
+
+# Логирование
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# те же условия, что в handlers/*_list.py, filter/filter.py и синхронизации с сайтом
+QUERIES = {
+    "афиша": select(Events.id, Events.date, Events.name, Events.title, Events.age_limits)
+    .where(Events.date >= date.today(), Events.is_free == True).order_by(Events.date.asc(), Events.id),
+    "новости": select(News).where(News.is_shown.is_(True)).order_by(desc(News.id)).limit(5),
+    "студии": select(Studios.id, Studios.name).where(Studios.cost == 0, Studios.category == "вокал")
+    .order_by(Studios.sort_name, Studios.id).limit(8),
+    "студии платные": select(Studios.id, Studios.name).where(Studios.cost > 0)
+    .order_by(Studios.sort_name, Studios.id).limit(8),
+    "студии (count)": select(func.count(Studios.id)).where(Studios.cost == 0),
+    "напоминания пользователя": select(UserEventTracking).where(
+        UserEventTracking.user_id == 1, UserEventTracking.event_id == 1
+    ),
+    "роль": select(Admin).where(Admin.user_id == 1),
+    "событие по названию": select(Events).where(Events.name == "x"),
+    "новость по названию": select(News).where(News.name == "x"),
+    "студия по названию": select(Studios).where(Studios.name == "x"),
+}
+
+
+def uses_index(plan: list[str]) -> bool:
+    """Ни одного полного просмотра таблицы."""
+    for detail in plan:
+        if detail.startswith("SCAN") and "INDEX" not in detail:
+            return False
+    return True
+
+
+def main():
+    # создаём синхронный движок
+    sync_engine = create_engine(DB_URL.replace("+aiosqlite", ""), echo=False)
+
+    failed = 0
+    with sync_engine.connect() as conn:
+        for title, query in QUERIES.items():
+            sql = str(query.compile(dialect=sync_engine.dialect, compile_kwargs={"literal_binds": True}))
+            plan = [row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+            if uses_index(plan):
+                logger.info(f"✅ {title}: {'; '.join(plan)}")
+            else:
+                failed += 1
+                logger.error(f"❌ {title}: {'; '.join(plan)}")
+
+    if failed:
+        logger.error(f"Без индекса: {failed} из {len(QUERIES)}")
+        sys.exit(1)
+    logger.info("Все запросы используют индексы")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Миграции схемы для уже существующих файлов SQLite.
+
+`Base.metadata.create_all` создаёт только отсутствующие таблицы,
+поэтому новые столбцы и индексы в старых таблицах добавляются здесь.
+Вызывается из `create_db` после `create_all`.
+"""
+
+import logging
+
+from sqlalchemy import inspect, select, update, insert, bindparam, func, case
+from sqlalchemy.engine import Connection
+
+from database.models import Base, Studios, StudioCategories, studio_sort_name, studio_category_code
+
+
+# ================== ЛОГИРОВАНИЕ ==================
+
+logger = logging.getLogger(__name__)
+
+
+def add_missing_columns(conn: Connection) -> None:
+    """Добавляет в таблицы столбцы моделей, которых ещё нет в БД."""
+    inspector = inspect(conn)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            ddl = f'ALTER TABLE {table.name} ADD COLUMN "{column.name}" {column.type.compile(dialect=conn.dialect)}'
+            if column.server_default is not None:
+                default = column.server_default.arg
+                default = f"'{default}'" if isinstance(default, str) else default.compile(dialect=conn.dialect)
+                ddl += f" DEFAULT {default}"
+            conn.exec_driver_sql(ddl)
+            logger.info(f"🛠 Добавлен столбец {table.name}.{column.name}")
+
+
+def remove_duplicates(conn: Connection, table, columns: list[str]) -> None:
+    """Оставляет по одной (самой ранней) строке на каждое значение `columns`."""
+    pk = table.primary_key.columns.keys()[0]
+    cols = ", ".join(f'"{name}"' for name in columns)
+    result = conn.exec_driver_sql(
+        f'DELETE FROM {table.name} WHERE "{pk}" NOT IN '
+        f'(SELECT MIN("{pk}") FROM {table.name} GROUP BY {cols})'
+    )
+    if result.rowcount:
+        logger.warning(f"🛠 {table.name}: удалено {result.rowcount} дублей по ({', '.join(columns)})")
+
+
+def add_missing_indexes(conn: Connection) -> None:
+    """Создаёт индексы моделей, которых ещё нет в БД; перед уникальным — чистит дубли."""
+    inspector = inspect(conn)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in sorted(table.indexes, key=lambda i: i.name):
+            if index.name in existing:
+                continue
+            if index.unique:
+                remove_duplicates(conn, table, [column.name for column in index.columns])
+            index.create(conn)
+            logger.info(f"🛠 Создан индекс {index.name}")
+
+
+# индексы, которые заменены другими и больше не нужны
+OBSOLETE_INDEXES = {
+    "studios": ["ix_studios_cost_category"],  # → ix_studios_cost_category_sort_name
+}
+
+
+def drop_obsolete_indexes(conn: Connection) -> None:
+    inspector = inspect(conn)
+    for table_name, names in OBSOLETE_INDEXES.items():
+        if not inspector.has_table(table_name):
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table_name)}
+        for name in names:
+            if name in existing:
+                conn.exec_driver_sql(f'DROP INDEX "{name}"')
+                logger.info(f"🛠 Удалён индекс {name}")
+
+
+def fill_studio_sort_names(conn: Connection) -> None:
+    """Заполняет studios.sort_name у строк, созданных до появления столбца."""
+    table = Studios.__table__
+    rows = conn.execute(select(table.c.id, table.c.name, table.c.title).where(table.c.sort_name.is_(None))).all()
+    if not rows:
+        return
+    conn.execute(
+        update(table).where(table.c.id == bindparam("studio_id")).values(sort_name=bindparam("value")),
+        [{"studio_id": row.id, "value": studio_sort_name(row.name, row.title)} for row in rows],
+    )
+    logger.info(f"🛠 Заполнен sort_name у {len(rows)} студий")
+
+
+def fill_studio_categories(conn: Connection) -> None:
+    """Заполняет studio_categories, если таблица только что создана в БД со студиями."""
+    if conn.execute(select(func.count()).select_from(StudioCategories.__table__)).scalar_one():
+        return
+    table = Studios.__table__
+    counts = conn.execute(
+        select(
+            table.c.category,
+            func.sum(case((table.c.cost == 0, 1), else_=0)),
+            func.sum(case((table.c.cost > 0, 1), else_=0)),
+        ).group_by(table.c.category)
+    ).all()
+    if not counts:
+        return
+    taken: set[str] = set()
+    rows = []
+    for name, free_count, paid_count in counts:
+        code = studio_category_code(name, taken)
+        taken.add(code)
+        rows.append({"code": code, "name": name, "free_count": free_count, "paid_count": paid_count})
+    conn.execute(insert(StudioCategories.__table__), rows)
+    logger.info(f"🛠 Заполнены категории студий: {len(rows)}")
+
+
+def run_migrations(conn: Connection) -> None:
+    add_missing_columns(conn)
+    drop_obsolete_indexes(conn)
+    add_missing_indexes(conn)
+    fill_studio_sort_names(conn)
+    fill_studio_categories(conn)
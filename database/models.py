@@ -2,6 +2,8 @@
 Модели базы данных для Telegram-бота ДК "Яуза".
 """
 
+import hashlib
+import re
 from datetime import datetime
 from email.policy import default
 
@@ -13,8 +15,25 @@ from sqlalchemy import (
     Boolean,
     Integer,
     BigInteger,
+    UniqueConstraint,
+    Index,
+    true,
 )
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, validates
+
+
+def studio_sort_name(name: str | None, title: str | None) -> str:
+    """Ключ сортировки студий: отображаемое название без кавычек, в нижнем регистре."""
+    return re.sub(r"[\"'«»‘’]", "", title or name or "").lower()
+
+
+def studio_category_code(category: str, taken=frozenset()) -> str:
+    """Короткий код категории для callback_data: начало md5, удлиняется при совпадении с занятым."""
+    digest = hashlib.md5(category.encode()).hexdigest()
+    for size in range(6, len(digest)):
+        if digest[:size] not in taken:
+            return digest[:size]
+    return digest
 
 
 class Base(DeclarativeBase):
@@ -38,24 +57,34 @@ class News(Base):
     """Новости, отображаемые пользователям."""
 
     __tablename__ = "news"
+    __table_args__ = (
+        # лента новостей: WHERE is_shown ORDER BY id DESC
+        Index("ix_news_is_shown_id", "is_shown", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    name: Mapped[str] = mapped_column(Text, nullable=False)
+    name: Mapped[str] = mapped_column(Text, nullable=False, index=True)
     title: Mapped[str] = mapped_column(Text, nullable=False, default='')
     description: Mapped[str] = mapped_column(Text, nullable=False)
     img: Mapped[str | None] = mapped_column(Text, nullable=True, default=None)
     is_shown: Mapped[bool] = mapped_column(Boolean, default=True)
     announced: Mapped[bool] = mapped_column(Boolean, default=False)
     lock_changes: Mapped[bool] = mapped_column(Boolean, default=False)
+    # хэш карточки на сайте (ссылка + текст + картинка), чтобы не перечитывать неизменённые
+    fingerprint: Mapped[str | None] = mapped_column(String(40), nullable=True, default=None)
 
 
 class Events(Base):
     """Мероприятия, доступные для записи."""
 
     __tablename__ = "events"
+    __table_args__ = (
+        # афиша: WHERE is_free = ? AND date >= ? ORDER BY date
+        Index("ix_events_is_free_date", "is_free", "date"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    name: Mapped[str] = mapped_column(Text, nullable=False)
+    name: Mapped[str] = mapped_column(Text, nullable=False, index=True)
     title: Mapped[str] = mapped_column(Text, nullable=False, default='')
     date: Mapped[datetime] = mapped_column(DateTime, nullable=False)
     description: Mapped[str] = mapped_column(Text, nullable=False)
@@ -66,15 +95,21 @@ class Events(Base):
     is_shown: Mapped[bool] = mapped_column(Boolean, default=True)
     announced: Mapped[bool] = mapped_column(Boolean, default=False)
     lock_changes: Mapped[bool] = mapped_column(Boolean, default=False)
+    # хэш карточки на сайте (ссылка + текст + картинка), чтобы не перечитывать неизменённые
+    fingerprint: Mapped[str | None] = mapped_column(String(40), nullable=True, default=None)
 
 
 class Studios(Base):
     """Студии и кружки."""
 
     __tablename__ = "studios"
+    __table_args__ = (
+        # список студий: WHERE cost ... AND category = ? ORDER BY sort_name
+        Index("ix_studios_cost_category_sort_name", "cost", "category", "sort_name"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    name: Mapped[str] = mapped_column(Text, nullable=False)
+    name: Mapped[str] = mapped_column(Text, nullable=False, index=True)
     title: Mapped[str] = mapped_column(Text, nullable=False, default='')
     description: Mapped[str] = mapped_column(Text, nullable=False)
     teacher: Mapped[str | None] = mapped_column(String, nullable=True)
@@ -87,6 +122,29 @@ class Studios(Base):
     is_shown: Mapped[bool] = mapped_column(Boolean, default=True)
     announced: Mapped[bool] = mapped_column(Boolean, default=False)
     lock_changes: Mapped[bool] = mapped_column(Boolean, default=False)
+    # хэш карточки на сайте (ссылка + текст + картинка), чтобы не перечитывать неизменённые
+    fingerprint: Mapped[str | None] = mapped_column(String(40), nullable=True, default=None)
+    # studio_sort_name(name, title); заполняется автоматически при изменении name / title
+    sort_name: Mapped[str | None] = mapped_column(Text, nullable=True, default=None)
+
+    @validates("name", "title")
+    def _update_sort_name(self, key: str, value: str) -> str:
+        name = value if key == "name" else self.name
+        title = value if key == "title" else self.title
+        self.sort_name = studio_sort_name(name, title)
+        return value
+
+
+class StudioCategories(Base):
+    """Категории студий: постоянный код для кнопок и число бесплатных / платных студий."""
+
+    __tablename__ = "studio_categories"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    code: Mapped[str] = mapped_column(String(32), nullable=False, unique=True)
+    name: Mapped[str] = mapped_column(Text, nullable=False, unique=True)
+    free_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    paid_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
 
 
 class Users(Base):
@@ -101,12 +159,43 @@ class Users(Base):
     subscribed: Mapped[bool] = mapped_column(Boolean, default=False)
     news_subscribed: Mapped[bool] = mapped_column(Boolean, default=False)
     events_subscribed: Mapped[bool] = mapped_column(Boolean, default=False)
+    # False — бот заблокирован / чат удалён, рассылки таким пользователям не отправляются
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True, server_default=true())
+
+
+class Broadcasts(Base):
+    """Рассылки: текст, картинка и тип клавиатуры под сообщением."""
+
+    __tablename__ = "broadcasts"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    kind: Mapped[str] = mapped_column(String, nullable=False)  # "news" | "events" | "all"
+    text: Mapped[str] = mapped_column(Text, nullable=False)
+    img: Mapped[str | None] = mapped_column(Text, nullable=True, default=None)
+    total: Mapped[int] = mapped_column(Integer, default=0)
+    finished: Mapped[bool] = mapped_column(Boolean, default=False)
+
+
+class BroadcastOutbox(Base):
+    """Очередь доставки рассылок: одна строка на (рассылка, пользователь)."""
+
+    __tablename__ = "broadcast_outbox"
+    __table_args__ = (UniqueConstraint("broadcast_id", "user_id"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    broadcast_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    user_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    status: Mapped[str] = mapped_column(String, default="pending")  # "pending" | "sent" | "failed"
 
 
 class UserEventTracking(Base):
     """Трекинг участия пользователей в событиях."""
 
     __tablename__ = "user_event_tracking"
+    __table_args__ = (
+        # одна подписка на пару (пользователь, событие); индексом миграции могут создать и в старой БД
+        Index("ux_user_event_tracking_user_event", "user_id", "event_id", unique=True),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
@@ -119,5 +208,17 @@ class Admin(Base):
     __tablename__ = "admins"
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    user_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    user_id: Mapped[int] = mapped_column(BigInteger, nullable=False, unique=True, index=True)
     role: Mapped[str] = mapped_column(String, default="editor")  # "editor" | "superadmin"
+
+
+class MediaCache(Base):
+    """Telegram file_id для картинок рассылок (по ссылке и хэшу содержимого)."""
+
+    __tablename__ = "media_cache"
+    __table_args__ = (UniqueConstraint("url", "content_hash"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    url: Mapped[str] = mapped_column(Text, nullable=False)
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    file_id: Mapped[str] = mapped_column(Text, nullable=False)
@@ -3,10 +3,48 @@ from typing import Optional, Sequence
 
 import sqlalchemy
 from requests import session
-from sqlalchemy import select, update, delete, DATETIME
+from sqlalchemy import select, update, delete, insert, func, case, DATETIME
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from database.models import News, Events, Studios, Users
+from database.models import (
+    News, Events, Studios, StudioCategories, Users, MediaCache, Broadcasts, BroadcastOutbox, studio_category_code,
+)
+
+
+# -------------------- SYNC --------------------
+
+async def _sync_by_name(session: AsyncSession, model, items: dict[str, dict], chunk: int = 500) -> tuple[list[str], int]:
+    """
+    Сверка спарсенных записей (Events / News) с БД за одну транзакцию.
+    items — {название: значения столбцов}. Существующие записи читаются
+    одним запросом, новые добавляются одним INSERT, незаблокированные
+    (lock_changes=False) обновляются одним UPDATE по первичному ключу.
+    Возвращает (названия добавленных записей, число обновлённых).
+    """
+    existing: dict[str, tuple[int, bool]] = {}
+    names = list(items)
+    for i in range(0, len(names), chunk):
+        result = await session.execute(
+            select(model.id, model.name, model.lock_changes)
+            .where(model.name.in_(names[i:i + chunk]))
+            .order_by(model.id)
+        )
+        for row_id, name, locked in result:
+            existing.setdefault(name, (row_id, locked))
+
+    to_insert, to_update = [], []
+    for name, values in items.items():
+        if name not in existing:
+            to_insert.append({"name": name, **values})
+        elif not existing[name][1]:
+            to_update.append({"id": existing[name][0], **values})
+
+    if to_insert:
+        await session.execute(insert(model), to_insert)
+    if to_update:
+        await session.execute(update(model), to_update)
+    await session.commit()
+    return [row["name"] for row in to_insert], len(to_update)
 
 
 # -------------------- NEWS --------------------
@@ -16,7 +54,8 @@ async def orm_add_news(session: AsyncSession, data: dict) -> int:
         name=data.get("name"),
         description=data.get("description"),
         img=data.get("img") or data.get("image"),
-        is_shown=bool(data.get("is_shown", True))
+        is_shown=bool(data.get("is_shown", True)),
+        fingerprint=data.get("fingerprint"),
     )
     session.add(obj)
     await session.flush()
@@ -49,6 +88,9 @@ async def orm_update_news(session: AsyncSession, news_id: int, values: dict):
     )
     await session.commit()
 
+async def orm_sync_news(session: AsyncSession, items: dict[str, dict]) -> tuple[list[str], int]:
+    return await _sync_by_name(session, News, items)
+
 # -------------------- EVENTS --------------------
 
 
@@ -87,11 +129,15 @@ async def orm_get_event_by_name(session: AsyncSession, name: str):
     result = await session.execute(select(Events).where(Events.name == name))
     return result.scalars().first()
 
+async def orm_sync_events(session: AsyncSession, items: dict[str, dict]) -> tuple[list[str], int]:
+    return await _sync_by_name(session, Events, items)
+
 # -------------------- STUDIOS --------------------
 
 async def orm_add_studio(session: AsyncSession, data: dict):
     new_studio = Studios(**{k: v for k, v in data.items() if k in Studios.__table__.c})
     session.add(new_studio)
+    await orm_refresh_studio_categories(session)
     await session.commit()
     return new_studio.id
 
@@ -101,6 +147,8 @@ async def orm_update_studio(session: AsyncSession, studio_id: int, field: str, v
     if not studio:
         return False
     setattr(studio, field, value)
+    if field in ("category", "cost"):
+        await orm_refresh_studio_categories(session)
     await session.commit()
     return True
 
@@ -109,6 +157,7 @@ async def orm_delete_studio(session: AsyncSession, studio_id: int):
     studio = await session.get(Studios, studio_id)
     if studio:
         await session.delete(studio)
+        await orm_refresh_studio_categories(session)
         await session.commit()
         return True
     return False
@@ -134,14 +183,124 @@ async def orm_get_studio_by_name(session: AsyncSession, name: str):
     result = await session.execute(query)
     return result.scalar_one_or_none()
 
-# -------------------USERS---------------------------
 
-# Получение юзера
-async def orm_last_seen_time_user(session: AsyncSession, user_id: int):
-    user = await session.get(Users, user_id)
-    user.updated = sqlalchemy.func.now()
+async def orm_sync_studios(
+    session: AsyncSession,
+    items: dict[str, dict],
+    keep_fingerprints: set[str] = frozenset(),
+    remove_missing: bool = False,
+    categories: dict[str, str] | None = None,
+) -> tuple[int, int, int]:
+    """
+    Сверка спарсенных студий с БД за одну транзакцию без пересоздания строк:
+    у существующих незаблокированных студий меняются только отличающиеся
+    столбцы (id сохраняется), новые добавляются. При remove_missing=True
+    удаляются незаблокированные студии, которых нет в items и чей
+    отпечаток не входит в keep_fingerprints (карточка не менялась).
+    categories — {название: категории} со вкладок сайта для всех карточек:
+    так обновляется категория студий, пропущенных без изменений. Если
+    вкладки прочитать не удалось (categories пуст), категория уже
+    сохранённых студий не меняется.
+    Возвращает (добавлено, изменено, удалено).
+    """
+    result = await session.execute(select(Studios).order_by(Studios.id))
+    existing: dict[str, Studios] = {}
+    duplicates: list[Studios] = []
+    for studio in result.scalars():
+        if studio.name in existing:
+            duplicates.append(studio)
+        else:
+            existing[studio.name] = studio
+
+    added = changed = removed = 0
+    for name, values in items.items():
+        studio = existing.get(name)
+        if studio is None:
+            session.add(Studios(name=name, **values))
+            added += 1
+            continue
+        if studio.lock_changes:
+            continue
+        if not categories:
+            values = {column: value for column, value in values.items() if column != "category"}
+        diff = {column: value for column, value in values.items() if getattr(studio, column) != value}
+        if diff:
+            for column, value in diff.items():
+                setattr(studio, column, value)
+            changed += 1
+
+    # карточка не менялась, но студию могли перенести в другую вкладку
+    for name, category in (categories or {}).items():
+        studio = existing.get(name)
+        if studio is None or name in items or studio.lock_changes:
+            continue
+        if studio.category != category:
+            studio.category = category
+            changed += 1
+
+    if remove_missing:
+        for studio in list(existing.values()) + duplicates:
+            if studio.lock_changes or (studio.name in items and existing.get(studio.name) is studio):
+                continue
+            if studio.fingerprint and studio.fingerprint in keep_fingerprints:
+                continue
+            await session.delete(studio)
+            removed += 1
+
+    await orm_refresh_studio_categories(session)
     await session.commit()
+    return added, changed, removed
+
+
+async def orm_refresh_studio_categories(session: AsyncSession) -> None:
+    """
+    Пересчитывает studio_categories по таблице studios (без commit).
+    Код категории, однажды выданный, не меняется; категории, в которых
+    не осталось студий, остаются с нулевыми счётчиками, чтобы старые
+    кнопки по-прежнему открывали свою категорию.
+    """
+    counts = await session.execute(
+        select(
+            Studios.category,
+            func.sum(case((Studios.cost == 0, 1), else_=0)),
+            func.sum(case((Studios.cost > 0, 1), else_=0)),
+        ).group_by(Studios.category)
+    )
+    result = await session.execute(select(StudioCategories))
+    existing = {category.name: category for category in result.scalars()}
+    taken = {category.code for category in existing.values()}
+
+    for name, free_count, paid_count in counts:
+        category = existing.pop(name, None)
+        if category is None:
+            code = studio_category_code(name, taken)
+            taken.add(code)
+            session.add(StudioCategories(code=code, name=name, free_count=free_count, paid_count=paid_count))
+            continue
+        category.free_count, category.paid_count = free_count, paid_count
+
+    for category in existing.values():
+        category.free_count = category.paid_count = 0
+
+
+async def orm_get_studio_categories(session: AsyncSession):
+    """Все категории: по алфавиту, «unknown» (Другое) в конце."""
+    result = await session.execute(
+        select(StudioCategories.code, StudioCategories.name, StudioCategories.free_count, StudioCategories.paid_count)
+        .order_by(StudioCategories.name == "unknown", StudioCategories.name)
+    )
+    return result.all()
+
+# -------------------FINGERPRINTS---------------------------
+
+async def orm_get_fingerprints(session: AsyncSession, model) -> set[str]:
+    """Отпечатки карточек сайта, уже сохранённых в таблице model (News / Events / Studios)."""
+    result = await session.execute(select(model.fingerprint).where(model.fingerprint.is_not(None)))
+    return set(result.scalars().all())
 
+# -------------------USERS---------------------------
+
+# Получение юзера
 async def orm_get_user(session: AsyncSession, user_id: int):
     return await session.get(Users, user_id)
 
@@ -158,9 +317,20 @@ async def orm_update_user_subscription(session: AsyncSession, user_id: int, news
         user.events_subscribed = events
     await session.commit()
 
+# Отключение пользователей, заблокировавших бота (одним UPDATE на пачку)
+async def orm_deactivate_users(session: AsyncSession, user_ids: Sequence[int], chunk: int = 500):
+    user_ids = list(user_ids)
+    for i in range(0, len(user_ids), chunk):
+        await session.execute(
+            update(Users)
+            .where(Users.user_id.in_(user_ids[i:i + chunk]), Users.is_active == True)
+            .values(is_active=False)
+        )
+    await session.commit()
+
 # Получение подписчиков
 async def orm_get_subscribers(session: AsyncSession, type_: str):
-    q = select(Users)
+    q = select(Users).where(Users.is_active == True)
     if type_ == "news":
         q = q.where(Users.news_subscribed == True)
     elif type_ == "events":
@@ -181,4 +351,93 @@ async def orm_add_user(session: AsyncSession, user_id: int, username: str = None
         )
         session.add(user)
         await session.commit()
-    return user
\ No newline at end of file
+    return user
+
+# -------------------MEDIA---------------------------
+
+async def orm_get_media_file_id(session: AsyncSession, url: str, content_hash: str) -> Optional[str]:
+    res = await session.execute(
+        select(MediaCache.file_id).where(MediaCache.url == url, MediaCache.content_hash == content_hash)
+    )
+    return res.scalars().first()
+
+
+async def orm_save_media_file_id(session: AsyncSession, url: str, content_hash: str, file_id: str):
+    res = await session.execute(
+        select(MediaCache).where(MediaCache.url == url, MediaCache.content_hash == content_hash)
+    )
+    obj = res.scalars().first()
+    if obj:
+        obj.file_id = file_id
+    else:
+        session.add(MediaCache(url=url, content_hash=content_hash, file_id=file_id))
+    await session.commit()
+
+# -------------------BROADCASTS----------------------
+
+async def orm_enqueue_broadcast(session: AsyncSession, kind: str, text: str, img: str | None, user_ids: Sequence[int]) -> int:
+    broadcast = Broadcasts(kind=kind, text=text, img=img, total=len(user_ids), finished=not user_ids)
+    session.add(broadcast)
+    await session.flush()
+    if user_ids:
+        await session.execute(
+            insert(BroadcastOutbox),
+            [{"broadcast_id": broadcast.id, "user_id": user_id, "status": "pending"} for user_id in user_ids],
+        )
+    await session.commit()
+    return broadcast.id
+
+
+async def orm_get_outbox_batch(session: AsyncSession, limit: int):
+    res = await session.execute(
+        select(BroadcastOutbox.id, BroadcastOutbox.broadcast_id, BroadcastOutbox.user_id)
+        .where(BroadcastOutbox.status == "pending")
+        .order_by(BroadcastOutbox.id)
+        .limit(limit)
+    )
+    return res.all()
+
+
+async def orm_get_broadcasts(session: AsyncSession, broadcast_ids) -> Sequence[Broadcasts]:
+    res = await session.execute(select(Broadcasts).where(Broadcasts.id.in_(broadcast_ids)))
+    return res.scalars().all()
+
+
+async def orm_set_outbox_status(session: AsyncSession, outbox_ids, status: str):
+    if outbox_ids:
+        await session.execute(
+            update(BroadcastOutbox).where(BroadcastOutbox.id.in_(outbox_ids)).values(status=status)
+        )
+
+
+async def orm_finish_broadcasts(session: AsyncSession, broadcast_ids) -> list[int]:
+    """Помечает завершёнными рассылки без строк в статусе pending."""
+    pending = select(BroadcastOutbox.broadcast_id).where(
+        BroadcastOutbox.broadcast_id.in_(broadcast_ids), BroadcastOutbox.status == "pending"
+    )
+    res = await session.execute(
+        update(Broadcasts)
+        .where(Broadcasts.id.in_(broadcast_ids), Broadcasts.id.not_in(pending))
+        .values(finished=True)
+        .returning(Broadcasts.id)
+    )
+    return list(res.scalars().all())
+
+
+async def orm_get_broadcasts_progress(session: AsyncSession, limit: int = 5) -> list[dict]:
+    broadcasts = (
+        await session.execute(select(Broadcasts).order_by(Broadcasts.id.desc()).limit(limit))
+    ).scalars().all()
+    if not broadcasts:
+        return []
+
+    counters = await session.execute(
+        select(BroadcastOutbox.broadcast_id, BroadcastOutbox.status, func.count())
+        .where(BroadcastOutbox.broadcast_id.in_([b.id for b in broadcasts]))
+        .group_by(BroadcastOutbox.broadcast_id, BroadcastOutbox.status)
+    )
+    progress = {b.id: {"id": b.id, "kind": b.kind, "created": b.created, "total": b.total,
+                       "finished": b.finished, "pending": 0, "sent": 0, "failed": 0} for b in broadcasts}
+    for broadcast_id, status, count in counters.all():
+        progress[broadcast_id][status] = count
+    return list(progress.values())
@@ -32,36 +32,73 @@ try:
 except:
     pass
 def check_message(message: types.Message) -> bool:
-    admins_list = os.getenv("ADMINS_LIST").replace(' ', '').split(',')
-    return str(message.from_user.id) in admins_list
+    return role_cache.is_super_admin(message.from_user.id)
 def get_admins_ids() -> list[str]:
     return os.getenv("ADMINS_LIST").replace(' ', '').split(',')
 def check_user(user :types.User) -> bool:
-    admins_list = os.getenv("ADMINS_LIST").replace(' ', '').split(',')
-    return str(user.id) in admins_list
+    return role_cache.is_super_admin(user.id)
+
+
+class RoleCache:
+    """
+    Роли пользователей в памяти: суперадмины из ADMINS_LIST и редакторы из таблицы admins.
+    Таблица читается один раз (на старте или при первой проверке), дальше
+    роль — поиск в словаре. Добавление и удаление редакторов в админке
+    обновляет кэш сразу (`set` / `remove`).
+    """
+
+    def __init__(self) -> None:
+        self._super_admins: frozenset[int] | None = None
+        self._roles: dict[int, str] | None = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._roles is not None
+
+    def super_admins(self) -> frozenset[int]:
+        if self._super_admins is None:
+            self._super_admins = frozenset(int(x) for x in get_admins_ids() if x.strip().lstrip('-').isdigit())
+        return self._super_admins
+
+    async def load(self, session: AsyncSession) -> None:
+        result = await session.execute(select(Admin.user_id, Admin.role))
+        self._roles = {user_id: role for user_id, role in result}
+
+    async def ensure(self, session: AsyncSession) -> None:
+        if self._roles is None:
+            await self.load(session)
+
+    def is_super_admin(self, user_id: int) -> bool:
+        return user_id in self.super_admins()
+
+    def role(self, user_id: int) -> str:
+        """Роль без обращения к БД; кэш должен быть загружен."""
+        if self.is_super_admin(user_id):
+            return "super_admin"
+        return (self._roles or {}).get(user_id, "user")
+
+    def set(self, user_id: int, role: str) -> None:
+        if self._roles is not None:
+            self._roles[user_id] = role
+
+    def remove(self, user_id: int) -> None:
+        if self._roles is not None:
+            self._roles.pop(user_id, None)
+
+
+role_cache = RoleCache()
+
 
 class IsSuperAdmin(Filter):
     async def __call__(self, message: types.Message, bot: Bot) -> bool:
-        return str(message.from_user.id) in get_admins_ids()
+        return role_cache.is_super_admin(message.from_user.id)
 
 
 class IsEditor(Filter):
     async def __call__(self, message: types.Message, session: AsyncSession) -> bool:
-        # проверяем в БД
-        result = await session.execute(
-            select(Admin).where(Admin.user_id == message.from_user.id, Admin.role == "editor")
-        )
-        return result.scalar_one_or_none() is not None
+        await role_cache.ensure(session)
+        return role_cache.role(message.from_user.id) == "editor"
 
 async def get_user_role(user_id: int, session: AsyncSession) -> str:
-    if str(user_id) in get_admins_ids():
-        return "super_admin"
-
-    result = await session.execute(
-        select(Admin).where(Admin.user_id == user_id)
-    )
-    admin = result.scalar_one_or_none()
-    if admin:
-        return admin.role
-
-    return "user"
\ No newline at end of file
+    await role_cache.ensure(session)
+    return role_cache.role(user_id)
@@ -1,5 +1,5 @@
 import logging
-from datetime import date, datetime
+from datetime import datetime
 from typing import Sequence
 
 from aiogram import Router, F
@@ -11,10 +11,13 @@ from aiogram.types import (
 )
 from aiogram.filters import Command
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, delete
+from sqlalchemy import select, delete
+from sqlalchemy.exc import IntegrityError
 
 from database.models import Events, UserEventTracking
 from database.orm_query import orm_get_event
+from logic.event_listing import event_listing
+from replyes.menus import keyboards
 
 # ================== ЛОГИРОВАНИЕ ==================
 
@@ -29,15 +32,6 @@ EVENTS_PER_PAGE = 8
 
 # ---------- Утилиты ----------
 
-def capitalize_title_safe(s: str) -> str:
-    """Делает первую букву заглавной, корректно обрабатывая кавычки и ёлочки."""
-    if not s:
-        return s
-    if s[0] in {"«", "\""} and len(s) > 1:
-        return f"{s[0]}{s[1:].capitalize()}"
-    return s.capitalize()
-
-
 async def safe_edit_message(message: Message, text: str, kb: InlineKeyboardMarkup | None = None) -> None:
     """
     Безопасное обновление сообщения:
@@ -62,22 +56,17 @@ async def safe_edit_message(message: Message, text: str, kb: InlineKeyboardMarku
 
 def get_category_menu() -> InlineKeyboardMarkup:
     """Меню выбора: бесплатные или платные события"""
-    category_kb = InlineKeyboardMarkup(inline_keyboard=[
-        [InlineKeyboardButton(text="🆓 Бесплатные", callback_data="events_free:1")],
-        [InlineKeyboardButton(text="💳 Платные", callback_data="events_paid:1")],
-        [InlineKeyboardButton(text="🏠 В Главное меню", callback_data="main_menu")]
-    ])
-    return category_kb
+    return keyboards.get("events_category")
 
 
-def get_events_keyboard(events: Sequence[Events], page: int, total_pages: int, is_free: bool) -> InlineKeyboardMarkup:
-    """Формирует клавиатуру для списка событий."""
+def get_events_keyboard(events: Sequence[tuple[int, str]], page: int, total_pages: int, is_free: bool) -> InlineKeyboardMarkup:
+    """Формирует клавиатуру для списка событий из пар (id, подпись)."""
     keyboard = [
         [InlineKeyboardButton(
-            text=f"🗓 {ev.date:%d.%m} | {capitalize_title_safe(ev.name[:30]) if ev.title == '' else ev.title[:30]} | {ev.age_limits}+",
-            callback_data=f"event_card:{ev.id}:{page}:{int(is_free)}"
+            text=label,
+            callback_data=f"event_card:{event_id}:{page}:{int(is_free)}"
         )]
-        for ev in events
+        for event_id, label in events
     ]
 
     nav_buttons = []
@@ -148,22 +137,11 @@ async def render_event_list(
     """Рендер списка событий с учётом фильтра бесплатности."""
     logger.debug(f"User {target.from_user.id} открыл {'бесплатные' if is_free else 'платные'} события")
 
+    # упорядоченные id и подписи всех предстоящих событий; страница — срез
+    entries = await event_listing.get(session, is_free)
     offset = (page - 1) * EVENTS_PER_PAGE
-    events = (
-        await session.execute(
-            select(Events)
-            .where(Events.date >= date.today(), Events.is_free == is_free)
-            .order_by(Events.date.asc())
-            .offset(offset)
-            .limit(EVENTS_PER_PAGE)
-        )
-    ).scalars().all()
-
-    total = (
-        await session.execute(
-            select(func.count(Events.id)).where(Events.date >= date.today(), Events.is_free == is_free)
-        )
-    ).scalar_one()
+    events = entries[offset:offset + EVENTS_PER_PAGE]
+    total = len(entries)
 
     total_pages = max((total + EVENTS_PER_PAGE - 1) // EVENTS_PER_PAGE, 1)
 
@@ -328,8 +306,12 @@ async def track_event_handler(callback: CallbackQuery, session: AsyncSession) ->
     )
     if not existing.scalars().first():
         session.add(UserEventTracking(user_id=user_id, event_id=int(event_id)))
-        await session.commit()
-        logger.info("Пользователь %s подписался на событие %s", user_id, event_id)
+        try:
+            await session.commit()
+            logger.info("Пользователь %s подписался на событие %s", user_id, event_id)
+        except IntegrityError:
+            # двойное нажатие: подписка уже записана параллельным запросом
+            await session.rollback()
 
     await callback.answer("✅ Вы подписались на напоминания")
     await render_event_detail(callback, session, int(event_id), int(page), bool(int(is_free)))
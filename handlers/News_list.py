@@ -66,6 +66,12 @@ def get_all_news_keyboard(news: list[News], page: int, total_pages: int) -> Inli
 
 
 # ---------- Рендеры ----------
+def neighbor_label(name: str, title: str) -> str:
+    """Заголовок соседней новости для карточки, не длиннее 100 символов."""
+    label = name if title == '' else title
+    return Big_litter_start(label[:100]) + ("…" if len(label) > 100 else "")
+
+
 async def render_news_card(target: Message | CallbackQuery, session: AsyncSession, news_id: int):
     """Отображение карточки новости"""
     try:
@@ -85,27 +91,32 @@ async def render_news_card(target: Message | CallbackQuery, session: AsyncSessio
             if len(description) > 350 else ""
         )
 
-        # Соседи для навигации
-        neighbors = (
-            await session.execute(
-                select(News).where(News.is_shown.is_(True)).order_by(desc(News.id))
-            )
-        ).scalars().all()
-
-        idx = next((i for i, n in enumerate(neighbors) if n.id == news.id), None)
+        # Соседи для навигации: лента идёт от новых к старым,
+        # «предыдущая» — ближайшая более новая, «следующие» — две более старые.
+        # Два keyset-запроса по индексу (is_shown, id), только нужные столбцы.
         neighbor_titles = []
-        if idx is not None:
-            if idx > 0:
-                prev_news = neighbors[idx - 1]
-                short_name = (prev_news.name[:100] if prev_news.title == '' else prev_news.title[:100])  + ("…" if len(prev_news.name if prev_news.title == '' else prev_news.title) > 100 else "")
-                neighbor_titles.append(f"⬅ <i>Предыдущая:</i> \n🗞 {Big_litter_start(short_name)}")
-
-            next_two = neighbors[idx + 1: idx + 3]
-            if next_two:
-                titles = "\n".join(
-                    f"🗞 {Big_litter_start(n.name[:100] if n.title == '' else n.title[:100]) + ('…' if len(n.name if n.title=='' else n.title) > 100 else '')}"
-                    for n in next_two
+        if news.is_shown:
+            newer = (
+                await session.execute(
+                    select(News.name, News.title)
+                    .where(News.is_shown.is_(True), News.id > news.id)
+                    .order_by(News.id)
+                    .limit(1)
                 )
+            ).first()
+            older = (
+                await session.execute(
+                    select(News.name, News.title)
+                    .where(News.is_shown.is_(True), News.id < news.id)
+                    .order_by(desc(News.id))
+                    .limit(2)
+                )
+            ).all()
+
+            if newer:
+                neighbor_titles.append(f"⬅ <i>Предыдущая:</i> \n🗞 {neighbor_label(*newer)}")
+            if older:
+                titles = "\n".join(f"🗞 {neighbor_label(*n)}" for n in older)
                 neighbor_titles.append(f"➡ <i>Следующие:</i>\n{titles}")
 
         text = f"<b>{Big_litter_start(news.name if news.title=='' else news.title)}</b>\n\n{short_desc}\n\n" + "\n".join(neighbor_titles)
@@ -218,18 +229,18 @@ async def list_news_handler(callback: CallbackQuery, session: AsyncSession):
     logger.info(f"Пользователь {callback.from_user.id} просматривает новости")
 
     try:
-        last_news = (
+        last_id = (
             await session.execute(
-                select(News).where(News.is_shown.is_(True)).order_by(desc(News.id)).limit(1)
+                select(News.id).where(News.is_shown.is_(True)).order_by(desc(News.id)).limit(1)
             )
-        ).scalars().first()
+        ).scalar()
 
-        if last_news:
+        if last_id:
             try:
                 await callback.message.delete()
             except:
                 pass
-            await render_news_card(callback, session, last_news.id)
+            await render_news_card(callback, session, last_id)
         else:
             await callback.answer("❌ Новостей нет", show_alert=True)
 
@@ -273,18 +284,18 @@ async def all_news_page_handler(callback: CallbackQuery, session: AsyncSession):
 async def news_prev_handler(callback: CallbackQuery, session: AsyncSession):
     """Перейти к предыдущей новости"""
     current_id = int(callback.data.split(":")[1])
-    prev_news = (
+    prev_id = (
         await session.execute(
-            select(News).where(News.is_shown.is_(True), News.id < current_id).order_by(desc(News.id)).limit(1)
+            select(News.id).where(News.is_shown.is_(True), News.id < current_id).order_by(desc(News.id)).limit(1)
         )
-    ).scalars().first()
+    ).scalar()
 
-    if prev_news:
+    if prev_id:
         try:
             await callback.message.delete()
         except:
             pass
-        await render_news_card(callback, session, prev_news.id)
+        await render_news_card(callback, session, prev_id)
     else:
         await callback.answer("Это самая старая новость")
 
@@ -293,17 +304,17 @@ async def news_prev_handler(callback: CallbackQuery, session: AsyncSession):
 async def news_next_handler(callback: CallbackQuery, session: AsyncSession):
     """Перейти к следующей новости"""
     current_id = int(callback.data.split(":")[1])
-    next_news = (
+    next_id = (
         await session.execute(
-            select(News).where(News.is_shown.is_(True), News.id > current_id).order_by(News.id).limit(1)
+            select(News.id).where(News.is_shown.is_(True), News.id > current_id).order_by(News.id).limit(1)
         )
-    ).scalars().first()
+    ).scalar()
 
-    if next_news:
+    if next_id:
         try:
             await callback.message.delete()
         except:
             pass
-        await render_news_card(callback, session, next_news.id)
+        await render_news_card(callback, session, next_id)
     else:
         await callback.answer("Это последняя новость")
\ No newline at end of file
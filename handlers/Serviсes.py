@@ -7,6 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from filter.filter import ChatTypeFilter
 from logic.helper import get_text
+from replyes.menus import keyboards
 
 
 
@@ -25,32 +26,12 @@ services_router.message.filter(ChatTypeFilter(["private"]))
 # ---------- Keyboards ----------
 def get_services_keyboard() -> InlineKeyboardMarkup:
     """Главное меню услуг"""
-    buttons = [
-        [InlineKeyboardButton(text="Верификация участника кружков", url="http://uslugi.mosreg.ru")],
-        [InlineKeyboardButton(text="Аренда помещений", callback_data="rent_menu")],
-        [InlineKeyboardButton(
-            text="Обратная связь",
-            url="https://forms.mkrf.ru/e/2579/xTPLeBU7/?ap_orgcode=640160132"
-        )],
-        [InlineKeyboardButton(text="Расписание студий (кружков)", url="https://дк-яуза.рф/upload/rasp.docx")],
-        [InlineKeyboardButton(text="🏠 В Главное меню", callback_data="main_menu")]
-    ]
-    return InlineKeyboardMarkup(inline_keyboard=buttons)
-
-
-def get_rent_menu_keyboard(msg_id: int) -> InlineKeyboardMarkup:
+    return keyboards.get("services")
+
+
+def get_rent_menu_keyboard() -> InlineKeyboardMarkup:
     """Меню аренды помещений"""
-    return InlineKeyboardMarkup(inline_keyboard=[
-        [InlineKeyboardButton(text="Большой зал", callback_data=f"big_hall_{msg_id}")],
-        [InlineKeyboardButton(text="Малый зал", callback_data=f"small_hall_{msg_id}")],
-        [InlineKeyboardButton(text="Бальный зал", callback_data=f"dance_hall_{msg_id}")],
-        [InlineKeyboardButton(
-            text="Аренда помещений (прайс)",
-            url="https://дк-яуза.рф/upload/iblock/d14/6tpgb3m5717z0eaxa0ghbx386zvtgnut.pdf"
-        )],
-        [InlineKeyboardButton(text="Ссылка на сайт", url="https://дк-яуза.рф/prostranstva/")],
-        [InlineKeyboardButton(text="🔙 Назад", callback_data="services")],
-    ])
+    return keyboards.get("rent_menu")
 
 
 def get_back_keyboard() -> InlineKeyboardMarkup:
@@ -74,26 +55,35 @@ async def show_rent_menu(callback: CallbackQuery) -> None:
     try:
         await callback.message.edit_text(
             "Аренда помещений",
-            reply_markup=get_rent_menu_keyboard(callback.message.message_id)
+            reply_markup=get_rent_menu_keyboard()
         )
     except Exception as e:
         logger.error("Ошибка при показе меню аренды: %s", e)
         await callback.message.answer("❌ Не удалось открыть меню аренды")
 
 
+def hall_message_id(callback: CallbackQuery) -> int:
+    """
+    Сообщение с меню аренды, которое нужно удалить. Кнопки старого формата
+    (big_hall_<id>) несут id в callback_data; у новых это само сообщение с кнопкой.
+    """
+    suffix = callback.data.rsplit("_", 1)[-1]
+    return int(suffix) if suffix.isdigit() else callback.message.message_id
+
+
 # --- Generic function for halls ---
 async def show_hall(
     callback: CallbackQuery,
     bot: Bot,
     hall_name: str,
-    msg_id: str,
+    msg_id: int,
     photos: list[str],
     description_text: str = "",
     extra_text: str = ""
 ) -> None:
     """Отображает зал с фото и описанием"""
     try:
-        await bot.delete_message(callback.message.chat.id, int(msg_id))
+        await bot.delete_message(callback.message.chat.id, msg_id)
         logger.debug("Удалено старое сообщение %s для зала %s", msg_id, hall_name)
     except Exception as e:
         logger.warning("Не удалось удалить сообщение %s: %s", msg_id, e)
@@ -114,14 +104,14 @@ async def show_hall(
 
 
 # --- Halls ---
-@services_router.callback_query(F.data.startswith("big_hall_"))
+@services_router.callback_query(F.data.startswith("big_hall"))
 async def show_big_hall(callback: CallbackQuery, bot: Bot) -> None:
 
     await show_hall(
         callback,
         bot,
         hall_name="Большой Зал",
-        msg_id=callback.data.split("_")[-1],
+        msg_id=hall_message_id(callback),
         photos=[
             "https://дк-яуза.рф/upload/iblock/e8e/9rghh0bjp38ly4r1y3r2mq5cuvgbinrb.JPG",
             "https://дк-яуза.рф/upload/iblock/823/sp566u4xoqrwnjrgsrdu3qu8kgon4b1u.JPG",
@@ -135,14 +125,14 @@ async def show_big_hall(callback: CallbackQuery, bot: Bot) -> None:
     )
 
 
-@services_router.callback_query(F.data.startswith("small_hall_"))
+@services_router.callback_query(F.data.startswith("small_hall"))
 async def show_small_hall(callback: CallbackQuery, bot: Bot) -> None:
 
     await show_hall(
         callback,
         bot,
         hall_name="Малый Зал",
-        msg_id=callback.data.split("_")[-1],
+        msg_id=hall_message_id(callback),
         photos=[
             "https://дк-яуза.рф/upload/iblock/ba6/xrmzvi87418sfqc38ll2ylfmwgyvg9e7.jpg",
             "https://дк-яуза.рф/upload/iblock/4dc/1sq4mqz0oizplwwbbvopk5x84gid0u1z.jpg",
@@ -156,7 +146,7 @@ async def show_small_hall(callback: CallbackQuery, bot: Bot) -> None:
     )
 
 
-@services_router.callback_query(F.data.startswith("dance_hall_"))
+@services_router.callback_query(F.data.startswith("dance_hall"))
 async def show_dance_hall(callback: CallbackQuery, bot: Bot) -> None:
 
 
@@ -164,7 +154,7 @@ async def show_dance_hall(callback: CallbackQuery, bot: Bot) -> None:
         callback,
         bot,
         hall_name="Бальный Зал",
-        msg_id=callback.data.split("_")[-1],
+        msg_id=hall_message_id(callback),
         photos=[
             "https://дк-яуза.рф/upload/iblock/3df/72pwgvfgf8vynkz1mqrqc19t2tjdkac0.JPG",
             "https://дк-яуза.рф/upload/iblock/7d1/o6p930nom2fqpn3pzh3d9dndd9ml0qji.JPG",
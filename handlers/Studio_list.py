@@ -1,6 +1,4 @@
-import hashlib
 import logging
-import re
 
 from aiogram import Router, F, types, Bot
 from aiogram.filters import Command
@@ -12,6 +10,7 @@ from sqlalchemy import select, func
 from database.models import Studios
 from database.orm_query import orm_get_studio
 from logic.helper import Big_litter_start
+from logic.studio_categories import studio_categories
 
 
 logger = logging.getLogger(__name__)
@@ -19,19 +18,8 @@ studios_router = Router()
 
 
 STUDIOS_PER_PAGE = 8
-CATEGORY_MAP: dict[str, str] = {}
-
-
-# ---------- Вспомогательные функции ----------
-
-
-def short_code(text: str) -> str:
-    return hashlib.md5(text.encode()).hexdigest()[:6]
-
-
-def sort_key(studio):
-    name = studio.title if studio.title else studio.name
-    return re.sub(r"[\"'«»‘’]", "", name).lower()
+# ответ на кнопку из старого сообщения с кодом категории, которой больше нет
+CATEGORY_GONE = "⚠ Этой категории больше нет.\n\n"
 
 
 # --------- Рендеры списка/краткой и подробной карточек студий
@@ -48,25 +36,25 @@ async def render_studio_list(callback: CallbackQuery, session: AsyncSession,
     else:
         cost_filter = (Studios.cost > 0)
 
-    # базовый запрос без offset/limit
-    query = select(Studios).where(cost_filter)
+    filters = [cost_filter]
     if category:
-        query = query.where(Studios.category == category)
-
-    # достаём все студии
-    studios = (await session.execute(query)).scalars().all()
-
-    # сортировка по имени без кавычек
-    sorted_studios = sorted(studios, key=sort_key)
+        filters.append(Studios.category == category)
 
     # считаем страницы
-    total = len(sorted_studios)
+    total = (await session.execute(select(func.count(Studios.id)).where(*filters))).scalar_one()
     total_pages = max((total + STUDIOS_PER_PAGE - 1) // STUDIOS_PER_PAGE, 1)
 
-    # нарезаем нужную страницу
-    start = (page - 1) * STUDIOS_PER_PAGE
-    end = start + STUDIOS_PER_PAGE
-    page_studios = sorted_studios[start:end]
+    # только нужная страница, отсортированная по имени без кавычек (Studios.sort_name);
+    # для кнопок хватает id, названия и цены
+    page_studios = (
+        await session.execute(
+            select(Studios.id, Studios.name, Studios.title, Studios.cost)
+            .where(*filters)
+            .order_by(Studios.sort_name, Studios.id)
+            .offset((page - 1) * STUDIOS_PER_PAGE)
+            .limit(STUDIOS_PER_PAGE)
+        )
+    ).all()
 
     if not page_studios:
         kb_back = InlineKeyboardMarkup(inline_keyboard=[[
@@ -231,20 +219,19 @@ async def start_studios(target: types.Message):
 @studios_router.callback_query(F.data.startswith("studios_free"))
 async def choose_category(callback: CallbackQuery, session: AsyncSession):
     is_free = callback.data.endswith("True")
+    await render_category_menu(callback, session, is_free)
+
 
-    # собираем список категорий
-    result = await session.execute(select(Studios.category).distinct())
-    categories = result.scalars().all()
+async def render_category_menu(callback: CallbackQuery, session: AsyncSession, is_free: bool, notice: str = ""):
+    # категории и их коды — из studio_categories (в памяти), без запроса к studios
+    await studio_categories.ensure(session)
 
     buttons = [
         [InlineKeyboardButton(text="📋 Показать все", callback_data=f"std_list_{is_free}_all")]
     ]
 
-    for category in categories:
+    for code, category in studio_categories.menu(is_free):
         display = 'Другое' if category == 'unknown' else (category or 'Не указано')
-        # В callback_data передаём оригинальное значение категории (без .lower()), чтобы фильтр был точным
-        code = short_code(category)
-        CATEGORY_MAP[code] = category  # сохраняем в словарь
         buttons.append([
             InlineKeyboardButton(
                 text=display.capitalize(),
@@ -255,10 +242,11 @@ async def choose_category(callback: CallbackQuery, session: AsyncSession):
     buttons.append([InlineKeyboardButton(text="⬅ Назад", callback_data="studios")])
 
     kb = InlineKeyboardMarkup(inline_keyboard=buttons)
-    await callback.message.edit_text(
-        f"Список {'бесплатных' if is_free else 'платных'} категорий студий:",
-        reply_markup=kb
-    )
+    text = f"{notice}Список {'бесплатных' if is_free else 'платных'} категорий студий:"
+    try:
+        await callback.message.edit_text(text, reply_markup=kb)
+    except Exception:
+        await callback.message.answer(text, reply_markup=kb)
     await callback.answer()
 
 
@@ -266,10 +254,13 @@ async def choose_category(callback: CallbackQuery, session: AsyncSession):
 @studios_router.callback_query(F.data.startswith("std_list_"))
 async def std_list(callback: CallbackQuery, session: AsyncSession, bot: Bot):
     # Ожидаем формат: std_list_{is_free}_<category_or_all>
-    _, _, is_free_str, category = callback.data.split("_", 3)
-    category = CATEGORY_MAP.get(category)
+    _, _, is_free_str, code = callback.data.split("_", 3)
     is_free = is_free_str == "True"
-    category = None if category == "all" else category
+    await studio_categories.ensure(session)
+    category = None if code == "all" else studio_categories.name(code)
+    if code != "all" and category is None:
+        await render_category_menu(callback, session, is_free, notice=CATEGORY_GONE)
+        return
     try:
         await callback.message.delete()
     except:
@@ -281,8 +272,12 @@ async def std_list(callback: CallbackQuery, session: AsyncSession, bot: Bot):
 async def std_p(callback: CallbackQuery, session: AsyncSession, bot: Bot):
     page = int(callback.data.split(":")[1])
     data = callback.data.split("_list_")[1]
-    is_free, category = data.split('_')
-    category = (None if category == 'all' else CATEGORY_MAP.get(category))
+    is_free, code = data.split('_')
+    await studio_categories.ensure(session)
+    category = None if code == 'all' else studio_categories.name(code)
+    if code != 'all' and category is None:
+        await render_category_menu(callback, session, is_free == "True", notice=CATEGORY_GONE)
+        return
     await render_studio_list(callback, session, is_free == "True", category, page)
 
 
@@ -2,7 +2,6 @@
 Обработчики панели администратора для управления событиями (Events).
 """
 
-import asyncio
 import logging
 from datetime import datetime
 
@@ -14,7 +13,6 @@ from aiogram.fsm.state import StatesGroup, State
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from database import orm_query
 from database.orm_query import (
     orm_add_event,
     orm_update_event,
@@ -22,8 +20,11 @@ from database.orm_query import (
     orm_get_events,
     orm_get_event_by_name, orm_get_event,
 )
+from logic.event_listing import event_listing
 from logic.helper import Big_litter_start
-from logic.scrap_events import update_all_events, find_age_limits
+from logic.scrap_common import find_age_limits
+from logic.single_flight import scrape_flights
+from logic.sync_service import sync_section
 from handlers.notification import notify_subscribers
 from filter.filter import IsEditor, IsSuperAdmin
 
@@ -205,6 +206,7 @@ async def add_event_img(message: Message, state: FSMContext, session: AsyncSessi
     data = await state.get_data()
 
     await orm_add_event(session, data)
+    event_listing.invalidate()
     await state.set_state(AddEventFSM.notify)
 
     logger.info(f"Добавлено событие: {data['name']} ({data['date']})")
@@ -326,6 +328,7 @@ async def edit_event_value(message: Message, state: FSMContext, session: AsyncSe
         value = value.lower() in ["да", "yes", 1,"True"]
     await orm_update_event(session, data["id"], {"lock_changes": True})
     await orm_update_event(session, data["id"], {field: value})
+    event_listing.invalidate()
     await state.clear()
     await message.answer("✅ Событие изменено!", reply_markup=get_admin_events_kb())
     logger.info(f"Событие id={data['id']} изменено (поле {field}) user_id={message.from_user.id}")
@@ -354,6 +357,7 @@ async def delete_events_page(callback: CallbackQuery, state: FSMContext):
 async def delete_event_confirm(callback: CallbackQuery, session: AsyncSession):
     event_id = int(callback.data.split("_")[2])
     await orm_delete_event(session, event_id)
+    event_listing.invalidate()
     await callback.message.answer("🗑 Событие удалено!", reply_markup=get_admin_events_kb())
 
 @admin_events_router.callback_query(F.data == "delete_all_events")
@@ -367,6 +371,7 @@ async def delete_all_events_handler(callback: CallbackQuery, session: AsyncSessi
                 deleted_count += 1
             except Exception as e:
                 logger.exception("Ошибка при массовом удалении события id=%s: %s", ev.id, e)
+    event_listing.invalidate()
     await callback.message.answer(
         f"🗑 Удалено событий: {deleted_count}\n"
         f"✅ Защищённые остались на месте.", reply_markup=back_kb()
@@ -387,69 +392,24 @@ async def update_all_events_prompt(callback: CallbackQuery) -> None:
 
 
 @admin_events_router.callback_query(F.data.startswith("update_all_events_"))
-async def update_all_events_handler(callback: CallbackQuery, session: AsyncSession, bot: Bot) -> None:
+async def update_all_events_handler(callback: CallbackQuery, bot: Bot) -> None:
     update = callback.data.endswith("True")
 
-    await callback.message.answer(
-        "🔄 Запускаю обновление афиши...\n"
-        "Примерное время: 2–3 минуты"
-    )
+    flight = scrape_flights.running("events")
+    if flight:
+        await callback.message.answer(
+            f"⏳ Обновление афиши уже выполняется, готово {flight.percent}%.\n"
+            "Пришлю результат, когда оно завершится"
+        )
+    else:
+        await callback.message.answer(
+            "🔄 Запускаю обновление афиши...\n"
+            "Обычно это занимает несколько секунд"
+        )
 
-    try:
-        data, log_text = await asyncio.to_thread(update_all_events)
-    except Exception as e:
-        await callback.message.answer(f"❌ Ошибка парсера: {e}")
-        logger.error(f"Ошибка обновления афиши: {e}", exc_info=True)
+    result, _ = await sync_section("events", bot, notify=update)
+    if not result.ok:
+        await callback.message.answer(f"❌ Ошибка парсера: {result.error}")
         return
 
-    updated, added = 0, 0
-
-    for name, values in data.items():
-        try:
-            event_date, description, age_limits, img, link, is_free = values
-        except ValueError:
-            await callback.message.answer(f"⚠ Ошибка формата данных: {name}")
-            logger.error(f"Некорректные данные события: {name}")
-            continue
-
-        event = await orm_query.orm_get_event_by_name(session, name)
-        if event:
-            if event.lock_changes == False:
-                await orm_update_event(session, event.id, {
-                    "date": datetime.strptime(event_date, "%Y-%m-%d %H:%M"),
-                    "description": description,
-                    "age_limits": age_limits,
-                    "img": img,
-                    "link": link,
-                    "is_free": is_free
-                })
-                updated += 1
-        else:
-            await orm_add_event(session, {
-                "name": name,
-                "date": datetime.strptime(event_date, "%Y-%m-%d %H:%M"),
-                "description": description,
-                "age_limits": age_limits,
-                "img": img,
-                "link": link,
-                "is_free": is_free
-            })
-            added += 1
-
-            if update:
-                text = f"{name.capitalize()} | +{age_limits}\n\n{event_date}"
-                await notify_subscribers(
-                    bot, session,
-                    f"📰 Обновление в афише! \n\n{text}",
-                    img,
-                    type_="events",
-                )
-                logger.info(f"Пользователи оповещены о новом событии: {name}")
-
-    await callback.message.answer(
-        f"{log_text}\n\n"
-        f"🔄 Обновлено: {updated}\n"
-        f"➕ Добавлено: {added}",
-        reply_markup=get_admin_events_kb(),
-    )
-    logger.info(f"Обновление афиши завершено: обновлено={updated}, добавлено={added}")
\ No newline at end of file
+    await callback.message.answer(result.report(), reply_markup=get_admin_events_kb())
\ No newline at end of file
@@ -1,4 +1,3 @@
-import asyncio
 import logging
 from dataclasses import field
 
@@ -11,13 +10,13 @@ from aiogram.utils.keyboard import InlineKeyboardBuilder
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from database import orm_query
 from database.orm_query import (
     orm_add_news, orm_update_news, orm_delete_news,
-    orm_get_all_news, orm_get_news
+    orm_get_all_news, orm_get_news,
 )
 from handlers.notification import notify_subscribers
-from logic.scrap_news import update_all_news
+from logic.single_flight import scrape_flights
+from logic.sync_service import sync_section
 from filter.filter import IsSuperAdmin, IsEditor
 
 
@@ -296,41 +295,21 @@ async def update_all_news_handler_question(callback: CallbackQuery):
 
 
 @admin_news_router.callback_query(F.data.startswith("update_all_news_"))
-async def update_all_news_handler(callback: CallbackQuery, session: AsyncSession, bot: Bot):
+async def update_all_news_handler(callback: CallbackQuery, bot: Bot):
     notify_users = callback.data.endswith("True")
     logger.info("Admin %s started updating all news (notify=%s)", callback.from_user.id, notify_users)
 
-    await callback.message.answer("🔄 Запускаю обновление новостей, пожалуйста подождите... (~1 минута)")
+    flight = scrape_flights.running("news")
+    if flight:
+        await callback.message.answer(
+            f"⏳ Обновление новостей уже выполняется, готово {flight.percent}%. Пришлю результат, когда оно завершится"
+        )
+    else:
+        await callback.message.answer("🔄 Запускаю обновление новостей, пожалуйста подождите...")
 
-    try:
-        data, log_text = await asyncio.to_thread(update_all_news)
-    except Exception as e:
-        logger.exception("News parser failed")
-        await callback.message.answer(f"❌ Ошибка парсера: {e}")
+    result, _ = await sync_section("news", bot, notify=notify_users)
+    if not result.ok:
+        await callback.message.answer(f"❌ Ошибка парсера: {result.error}")
         return
 
-    updated, added = 0, 0
-    for name, values in data.items():
-        try:
-            description, img = values
-        except ValueError:
-            logger.warning("Ошибка формата данных: %s", name)
-            await callback.message.answer(f"⚠ Ошибка формата данных: {name}")
-            continue
-
-        news = await orm_query.orm_get_news_by_name(session, name)
-        if news:
-            if news.lock_changes == False:
-                await orm_update_news(session, news.id, {"description": description, "img": img})
-                updated += 1
-        else:
-            await orm_add_news(session, {"name": name, "description": description, "img": img})
-            added += 1
-            if notify_users:
-                await notify_subscribers(bot, session, f"📰 Обновление в новостях!\n\n{name.capitalize()}", img, type_="news")
-
-    logger.info("News update completed: updated=%d, added=%d", updated, added)
-    await callback.message.answer(
-        f"{log_text}\n\n🔄 Обновлено: {updated}\n➕ Добавлено: {added}",
-        reply_markup=get_admin_news_kb()
-    )
\ No newline at end of file
+    await callback.message.answer(result.report(), reply_markup=get_admin_news_kb())
\ No newline at end of file
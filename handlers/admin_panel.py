@@ -10,8 +10,9 @@ from aiogram.utils.keyboard import InlineKeyboardBuilder
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete
 
-from filter.filter import ChatTypeFilter, IsAdmin, IsEditor, IsSuperAdmin, get_user_role
+from filter.filter import ChatTypeFilter, IsAdmin, IsEditor, IsSuperAdmin, get_user_role, role_cache
 from database.models import Admin, Users
+from database.orm_query import orm_get_broadcasts_progress
 from handlers.notification import send_event_reminders, notify_all_users
 from logic.cmd_list import private
 from logic.helper import load_texts, save_texts, get_text
@@ -63,6 +64,7 @@ async def admin_panel_menu(user: types.User, bot: Bot, session: AsyncSession) ->
         buttons.append([InlineKeyboardButton(text="Редактировать Администраторов", callback_data="manage_editors")])
         buttons.append([InlineKeyboardButton(text="Изменить текст вкладок", callback_data="change_fields")])
         buttons.append([InlineKeyboardButton(text="Отправить всем!📢", callback_data="notify_all_start")])
+        buttons.append([InlineKeyboardButton(text="📊 Статус рассылок", callback_data="broadcasts_status")])
 
     buttons.append([InlineKeyboardButton(text="🏠 В Главное меню", callback_data="main_menu")])
     return InlineKeyboardMarkup(inline_keyboard=buttons)
@@ -131,8 +133,15 @@ async def remove_editor(callback: CallbackQuery, state: FSMContext):
 async def editor_add_handler(message: types.Message, state: FSMContext, session: AsyncSession):
     try:
         user_id = int(message.text)
+        existing = await session.execute(select(Admin).where(Admin.user_id == user_id))
+        admin = existing.scalars().first()
+        if admin:
+            await message.answer(f"ℹ️ Пользователь {user_id} уже в списке ({admin.role})")
+            await state.clear()
+            return
         session.add(Admin(user_id=user_id, role="editor"))
         await session.commit()
+        role_cache.set(user_id, "editor")
         logger.debug(f"Добавлен новый редактор {user_id}")
         await message.answer(f"✅ Пользователь {user_id} назначен редактором")
     except Exception as e:
@@ -147,6 +156,7 @@ async def editor_remove_handler(message: types.Message, state: FSMContext, sessi
         user_id = int(message.text)
         await session.execute(delete(Admin).where(Admin.user_id == user_id))
         await session.commit()
+        role_cache.remove(user_id)
         logger.debug(f"Редактор {user_id} удалён")
         await message.answer(f"✅ Пользователь {user_id} удален из редакторов")
     except Exception as e:
@@ -282,8 +292,50 @@ async def notify_confirm(callback: CallbackQuery, state: FSMContext, bot: Bot, s
     img = data.get("img")
 
     logger.info(f"Пользователь {callback.from_user.id} подтвердил рассылку")
-    await notify_all_users(bot, session, text, img)
-    await callback.message.answer("✅ Уведомление отправлено!")
+    broadcast_id = await notify_all_users(bot, session, text, img)
+    await callback.message.answer(
+        f"✅ Рассылка #{broadcast_id} поставлена в очередь!",
+        reply_markup=InlineKeyboardMarkup(
+            inline_keyboard=[[InlineKeyboardButton(text="📊 Статус рассылок", callback_data="broadcasts_status")]]
+        ),
+    )
+    await callback.answer()
+
+
+# --- Broadcasts progress ---
+async def build_broadcasts_status(session: AsyncSession) -> str:
+    kinds = {"news": "новости", "events": "афиша", "all": "всем"}
+    progress = await orm_get_broadcasts_progress(session)
+    if not progress:
+        return "📊 Рассылок пока не было."
+
+    text = "📊 Последние рассылки:\n\n"
+    for p in progress:
+        state = "✅ завершена" if p["finished"] else "⏳ идёт"
+        text += (
+            f"#{p['id']} ({kinds.get(p['kind'], p['kind'])}) {p['created']:%d.%m %H:%M} — {state}\n"
+            f"   отправлено {p['sent']}/{p['total']}, ошибок {p['failed']}, в очереди {p['pending']}\n"
+        )
+    return text
+
+
+@admin_router.message(Command("broadcasts"))
+async def broadcasts_status_cmd(message: types.Message, session: AsyncSession):
+    await message.answer(await build_broadcasts_status(session))
+
+
+@admin_router.callback_query(F.data == "broadcasts_status")
+async def broadcasts_status(callback: CallbackQuery, session: AsyncSession):
+    kb = InlineKeyboardMarkup(
+        inline_keyboard=[
+            [InlineKeyboardButton(text="🔄 Обновить", callback_data="broadcasts_status")],
+            [InlineKeyboardButton(text="🛠 В Панель администратора", callback_data="admin_panel")],
+        ]
+    )
+    try:
+        await callback.message.edit_text(await build_broadcasts_status(session), reply_markup=kb)
+    except Exception as e:
+        logger.debug(f"Статус рассылок не изменился: {e}")
     await callback.answer()
 
 
@@ -336,7 +388,7 @@ async def receive_new_value(message: types.Message, state: FSMContext):
     key = data["key"]
     texts = load_texts()
     texts[key] = message.text
-    save_texts(texts)
+    await save_texts(texts)
     await message.answer(f"✅ Текст для <b>{key}</b> обновлён.",
                          reply_markup=InlineKeyboardMarkup(inline_keyboard=[[InlineKeyboardButton(text="Назад",callback_data="change_fields")]]))
     await state.clear()
\ No newline at end of file
@@ -1,4 +1,3 @@
-import asyncio
 import logging
 from aiogram import Router, F
 from aiogram.types import Message, CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup
@@ -13,10 +12,12 @@ from database.orm_query import (
     orm_update_studio,
     orm_delete_studio,
     orm_get_studios,
-    orm_get_studio_by_name, orm_get_studio,
+    orm_get_studio,
 )
 from logic.helper import Big_litter_start
-from logic.scrap_studios import update_all_studios
+from logic.single_flight import scrape_flights
+from logic.studio_categories import studio_categories
+from logic.sync_service import sync_section
 from filter.filter import IsSuperAdmin, IsEditor
 
 # ================== ЛОГИРОВАНИЕ ==================
@@ -219,6 +220,7 @@ async def add_studio_img(message: Message, state: FSMContext, session: AsyncSess
 
     try:
         await orm_add_studio(session, data)
+        studio_categories.invalidate()
         logger.info("Студия добавлена: %s", data.get("title"))
         await message.answer("✅ Студия успешно добавлена!", reply_markup=get_admin_studios_kb())
     except Exception as e:
@@ -327,6 +329,7 @@ async def edit_studio_value(message: Message, state: FSMContext, session: AsyncS
     try:
         await orm_update_studio(session, studio_id, "lock_changes", True)
         await orm_update_studio(session, studio_id, field, value)
+        studio_categories.invalidate()
         logger.info("Обновлено поле %s у студии id=%s", field, studio_id)
         await message.answer("✅ Студия успешно изменена!", reply_markup=get_admin_studios_kb())
     except Exception as e:
@@ -367,6 +370,7 @@ async def delete_studio_confirm(callback: CallbackQuery, session: AsyncSession):
     studio_id = int(callback.data.split("_")[2])
     try:
         await orm_delete_studio(session, studio_id)
+        studio_categories.invalidate()
         logger.info("Удалена студия id=%s", studio_id)
         await callback.message.answer("🗑 Студия удалена!", reply_markup=get_admin_studios_kb())
     except Exception as e:
@@ -376,79 +380,20 @@ async def delete_studio_confirm(callback: CallbackQuery, session: AsyncSession):
 
 # --- Update All Studios ---
 @admin_studios_router.callback_query(F.data == "update_all_studios")
-async def update_all_studios_handler(callback: CallbackQuery, session: AsyncSession):
+async def update_all_studios_handler(callback: CallbackQuery):
     logger.info("Запуск обновления всех студий (user_id=%s)", callback.from_user.id)
-    await callback.message.answer("🔄 Обновление студий... (~4 минуты)")
+    flight = scrape_flights.running("studios")
+    if flight:
+        await callback.message.answer(f"⏳ Обновление студий уже выполняется, готово {flight.percent}%...")
+    else:
+        await callback.message.answer("🔄 Обновление студий...")
 
-    try:
-        data, log_text = await asyncio.to_thread(update_all_studios)
-    except Exception as e:
-        logger.exception("Ошибка при вызове парсера студий: %s", e)
-        await callback.message.answer(f"❌ Ошибка при вызове парсера: {e}")
+    result, _ = await sync_section("studios")
+    if not result.ok:
+        await callback.message.answer(f"❌ Ошибка при вызове парсера: {result.error}")
         return
 
-
-
-
-    updated, added = 0, 0
-
-    for name, values in data.items():
-        try:
-            description, cost, second_cost, age, img, qr_img, teacher, category = values
-        except ValueError:
-            logger.warning("Пропущена студия %s: неверный формат данных", name)
-            await callback.message.answer(f"⚠️ Пропущена студия {name}: неверный формат данных")
-            continue
-
-        try:
-            studios = await orm_get_studios(session)
-            studio = await orm_get_studio_by_name(session, name)
-            if studio:
-                if (studio.lock_changes == False):
-                    try:
-                        await orm_delete_studio(session, studio.id)
-                    except Exception as e:
-                        logger.exception("Ошибка при массовом удалении студии id=%s: %s", studio.id, e)
-
-                    new_data = {
-                        "name": name,
-                        "description": description,
-                        "teacher": teacher,
-                        "cost": int(cost),
-                        "second_cost": second_cost,
-                        "age": age,
-                        "category": category,
-                        "qr_img": qr_img,
-                        "img": img,
-                    }
-                    await orm_add_studio(session, new_data)
-                    updated += 1
-                    logger.debug("Обновлена студия %s", name)
-            else:
-                new_data = {
-                    "name": name,
-                    "description": description,
-                    "teacher": teacher,
-                    "cost": int(cost),
-                    "second_cost": second_cost,
-                    "age": age,
-                    "category": category,
-                    "qr_img": qr_img,
-                    "img": img,
-                }
-                await orm_add_studio(session, new_data)
-                added += 1
-                logger.debug("Добавлена новая студия %s", name)
-        except Exception as e:
-            logger.exception("Ошибка при обработке студии %s: %s", name, e)
-
-    logger.info("Обновление студий завершено. Обновлено=%d, Добавлено=%d", updated, added)
-    await callback.message.answer(
-        f"{log_text}\n\n"
-        f"🔄 Обновлено: {updated}\n"
-        f"➕ Добавлено: {added}",
-        reply_markup=get_admin_studios_kb()
-    )
+    await callback.message.answer(result.report(), reply_markup=get_admin_studios_kb())
 
 
 @admin_studios_router.callback_query(F.data == "delete_all_studios")
@@ -467,6 +412,7 @@ async def delete_all_studios_handler(callback: CallbackQuery, session: AsyncSess
                 except Exception as e:
                     # логируем, но не прерываем цикл
                     logger.exception("Ошибка при массовом удалении студии id=%s: %s", st.id, e)
+        studio_categories.invalidate()
 
         await callback.message.answer(
             f"🗑 Удалено студий: {deleted_count}\n"
@@ -5,13 +5,14 @@ from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from database.orm_query import orm_get_user, orm_add_user, orm_last_seen_time_user
+from database.orm_query import orm_get_user, orm_add_user
 from filter.filter import ChatTypeFilter, get_user_role
 from handlers.News_list import render_all_news
 from handlers.Serviсes import get_services_keyboard
 from handlers.notification import get_subscriptions_kb
 
 from logic.helper import get_text
+from replyes.menus import keyboards
 
 
 # ================== ЛОГИРОВАНИЕ ==================
@@ -28,26 +29,7 @@ menu2_router.message.filter(ChatTypeFilter(["private"]))
 # ---------- Главное меню ----------
 async def get_main_menu_kb(user: types.User, session: AsyncSession) -> InlineKeyboardMarkup:
     role = await get_user_role(user.id, session)
-    buttons = [
-        [
-            InlineKeyboardButton(text="📆 Афиша мероприятий", callback_data="events"),
-            InlineKeyboardButton(text="💃 Студии", callback_data="studios"),
-        ],
-        [
-            InlineKeyboardButton(text="🗞 Новости", callback_data="list_news"),
-            InlineKeyboardButton(text="🖍 Подписки", callback_data="notifications_"),
-        ],
-        [
-            InlineKeyboardButton(text="💼 Услуги", callback_data="services"),
-            InlineKeyboardButton(text="📍 Контакты", callback_data="contacts"),
-        ],
-        [InlineKeyboardButton(text="Верификация участника кружков", url="http://uslugi.mosreg.ru")],
-        [InlineKeyboardButton(text="💬 Помощь", callback_data="help")],
-    ]
-    if role != "user":
-        buttons.append([InlineKeyboardButton(text="🛠 Панель администратора", callback_data="admin_panel")])
-
-    return InlineKeyboardMarkup(inline_keyboard=buttons)
+    return keyboards.get("main_menu", role != "user")
 
 
 async def render_main_menu(target: types.Message | CallbackQuery, session: AsyncSession):
@@ -60,22 +42,7 @@ async def render_main_menu(target: types.Message | CallbackQuery, session: Async
         logger.warning("Попытка рендера главного меню для неизвестного объекта: %s", type(target))
         return
 
-    # Добавляем/обновляем пользователя
-    try:
-        await orm_add_user(
-            session,
-            user_id=user.id,
-            username=user.username,
-            first_name=user.first_name,
-            last_name=user.last_name
-        )
-    except Exception as e:
-        logger.warning(f"Не удалось добавить пользователя при рендере главного меню {e}")
-
-    try:
-        await orm_last_seen_time_user(session, user.id)
-    except Exception as e:
-        logger.warning(f"Не удалось обновить время последнего визита пользователя {e}")
+    # пользователя создаёт и отмечает время визита middleware DataBaseSession
 
     logger.info("Пользователь %s (%s) вошел в главное меню", user.id, user.username)
 
@@ -3,12 +3,20 @@ from aiogram.filters import Command
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
 from sqlalchemy import select
+import asyncio
 import logging
 
 from database.models import Users, Events, UserEventTracking
 from filter.filter import ChatTypeFilter
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton, CallbackQuery
-from database.orm_query import orm_get_user, orm_update_user_subscription, orm_add_user
+from database.orm_query import (
+    orm_get_user, orm_update_user_subscription, orm_add_user, orm_enqueue_broadcast, orm_deactivate_users,
+)
+from logic.broadcast import broadcaster, send_with_fallback
+from logic.media_cache import prepare_photo
+from logic.outbox import outbox_dispatcher
+from logic.user_activity import user_cache
+from replyes.menus import keyboards
 
 
 # ================== ЛОГИРОВАНИЕ ==================
@@ -41,22 +49,7 @@ async def get_or_create_user(session: AsyncSession, tg_user: types.User):
 
 # ---------- Клавиатура подписок ----------
 def get_subscriptions_kb(user):
-    buttons = []
-
-    # Новости
-    if user.news_subscribed:
-        buttons.append([InlineKeyboardButton(text="✅ Вы подписаны на новости", callback_data="unsub_news")])
-    else:
-        buttons.append([InlineKeyboardButton(text="❌ Вы не подписаны на новости", callback_data="sub_news")])
-
-    # Мероприятия
-    if user.events_subscribed:
-        buttons.append([InlineKeyboardButton(text="✅ Вы подписаны на афишу", callback_data="unsub_events")])
-    else:
-        buttons.append([InlineKeyboardButton(text="❌ Вы не подписаны на афишу", callback_data="sub_events")])
-
-    buttons.append([InlineKeyboardButton(text="🏠 В Главное меню", callback_data='main_menu')])
-    return InlineKeyboardMarkup(inline_keyboard=buttons)
+    return keyboards.get("subscriptions", bool(user.news_subscribed), bool(user.events_subscribed))
 
 
 async def build_subscriptions_text(session, user_id: int) -> str:
@@ -133,208 +126,124 @@ async def toggle_subscription(callback: CallbackQuery, session: AsyncSession):
         logger.info(f"Пользователь {user_id} отписался от афиши")
 
 
+    user_cache.invalidate(user_id)
     user = await orm_get_user(session, user_id)
     await callback.message.edit_reply_markup(reply_markup=get_subscriptions_kb(user))
     await callback.answer(text)
 
 
 # ---------- Рассылка новостей и событий ----------
-async def notify_subscribers(bot, session: AsyncSession, text: str, img: str | None = None, type_: str = "news"):
+async def notify_subscribers(bot, session: AsyncSession, text: str, img: str | None = None, type_: str = "news") -> int:
+    """Ставит рассылку подписчикам в очередь, возвращает её номер."""
     if type_ == "news":
         filter_field = Users.news_subscribed
     else:
         filter_field = Users.events_subscribed
 
-    result = await session.execute(select(Users.user_id).where(filter_field == True))
+    result = await session.execute(
+        select(Users.user_id).where(filter_field == True, Users.is_active == True)
+    )
     subscribers = result.scalars().all()
-    kb_news = InlineKeyboardMarkup(inline_keyboard=[[InlineKeyboardButton(text="🗞 К Новостям", callback_data="list_news")]])
-    kb_events = InlineKeyboardMarkup(inline_keyboard=[[InlineKeyboardButton(text="🗓 К Афише мероприятий", callback_data='events_new_message')]])
-    for user_id in subscribers:
-        try:
-            try:
-                await bot.send_photo(user_id, img, caption=text[:1024], parse_mode="HTML", reply_markup=kb_news if type_ == 'news' else kb_events)
-                logger.info(f"Рассылка c картинками отправлена")
-            except:
-                await bot.send_message(user_id, text[:4096], parse_mode="HTML")
-                logger.info(f"Рассылка без картинок отправлена")
 
-        except Exception as e:
-            logger.warning(f"Рассылка не удалась")
+    broadcast_id = await orm_enqueue_broadcast(session, type_, text, img, subscribers)
+    outbox_dispatcher.wake()
+    logger.info(f"Рассылка #{broadcast_id} ({type_}) поставлена в очередь: {len(subscribers)} получателей")
+    return broadcast_id
 
 
 # ---------- Напоминания о мероприятиях ----------
+def _when_text(days_left: int) -> str:
+    if days_left == 0:
+        return "Уже сегодня"
+    if days_left == 1:
+        return "Через 1 день"
+    return f"Через {days_left} {'дня' if days_left < 5 else 'дней'}"
+
+
+def _event_card_button(event: Events, text: str) -> InlineKeyboardButton:
+    return InlineKeyboardButton(text=text, callback_data=f"event_card:{event.id}:{1}:{int(event.is_free)}")
+
+
+def build_reminder(events: list[Events], today) -> tuple[str, InlineKeyboardMarkup]:
+    """Текст и клавиатура напоминания: одно событие — карточка, несколько — сводка."""
+    if len(events) == 1:
+        event = events[0]
+        days_left = (event.date.date() - today).days
+        text = (
+            f"🔔 Напоминание!\n\n"
+            f"{_when_text(days_left)} состоится мероприятие:\n\n"
+            f"<b>{event.name}</b>\n"
+            f"🗓 {event.date:%d.%m.%Y %H:%M}\n\n"
+            f"{(event.description or '')[:200]}..."
+        )
+        kb = InlineKeyboardMarkup(inline_keyboard=[[_event_card_button(event, "📆Афиша мероприятий")]])
+        return text, kb
+
+    text = "🔔 Напоминание!\n\nСкоро состоятся отслеживаемые вами мероприятия:\n\n"
+    for event in events:
+        days_left = (event.date.date() - today).days
+        text += f"• <b>{event.name}</b>\n   🗓 {event.date:%d.%m.%Y %H:%M} — {_when_text(days_left).lower()}\n"
+    kb = InlineKeyboardMarkup(inline_keyboard=[
+        [_event_card_button(event, f"📆 {event.name[:40]}")] for event in events
+    ])
+    return text, kb
+
+
 async def send_event_reminders(bot, session):
-    now = datetime.now().date()
-    two_days = now + timedelta(days=2)
+    """Одно напоминание каждому пользователю по всем его событиям на ближайшие 2 дня."""
+    today = datetime.now().date()
+    two_days = today + timedelta(days=2)
 
-    # выбираем события на ближайшие 2 дня
+    # все пары (пользователь, событие) одним запросом
     result = await session.execute(
-        select(Events).where(Events.date.between(now, two_days))
+        select(UserEventTracking.user_id, Events)
+        .join(Events, Events.id == UserEventTracking.event_id)
+        .join(Users, Users.user_id == UserEventTracking.user_id)
+        .where(Events.date.between(today, two_days), Users.is_active == True)
+        .order_by(UserEventTracking.user_id, Events.date)
     )
-    events = result.scalars().all()
-
-    if not events:
-        logger.info("Нет событий в ближайшие 2 дня")
+    by_user: dict[int, list[Events]] = {}
+    for user_id, event in result.all():
+        events = by_user.setdefault(user_id, [])
+        if event not in events:
+            events.append(event)
+
+    if not by_user:
+        logger.info("Нет отслеживаемых событий в ближайшие 2 дня")
         return
 
-    for event in events:
-        # находим пользователей, отслеживающих событие
-        tracking_users = await session.execute(
-            select(UserEventTracking.user_id).where(UserEventTracking.event_id == event.id)
-        )
-        user_ids = tracking_users.scalars().all()
-
-        if not user_ids:
-            continue
-
-        # считаем разницу в днях
-        days_left = (event.date.date() - now).days
-        if days_left < 0:
-            continue
-        elif days_left == 0:
-            text = (
-                f"🔔 Напоминание!\n\n"
-                f"Уже Сегодня состоится мероприятие:\n\n"
-                f"<b>{event.name}</b>\n"
-                f"🗓 {event.date:%d.%m.%Y %H:%M}\n\n"
-                f"{(event.description or '')[:200]}..."
-            )
-        else:
-            text = (
-                f"🔔 Напоминание!\n\n"
-                f"Через {days_left} {'день' if days_left == 1 else 'дней'} состоится мероприятие:\n\n"
-                f"<b>{event.name}</b>\n"
-                f"🗓 {event.date:%d.%m.%Y %H:%M}\n\n"
-                f"{(event.description or '')[:200]}..."
-            )
+    # картинки нужны только одиночным напоминаниям; готовим каждую один раз
+    single_events = {events[0].id: events[0] for events in by_user.values() if len(events) == 1}
+    prepared = await asyncio.gather(*(prepare_photo(event.img) for event in single_events.values()))
+    photos = dict(zip(single_events, prepared))
 
-        # рассылаем уведомления
-        for user_id in user_ids:
-            try:
-                if event.img:
-                    try:
-                        await bot.send_photo(user_id, event.img, caption=text, parse_mode="HTML",reply_markup=InlineKeyboardMarkup(
-                            inline_keyboard=[[InlineKeyboardButton(text="📆Афиша мероприятий",
-                                                                   callback_data=f"event_card:{event.id}:{1}:{int(event.is_free)}")]]))
-                    except Exception:
-                        await bot.send_message(user_id, text, parse_mode="HTML")
-                else:
-                    await bot.send_message(user_id, text, parse_mode="HTML")
+    reminders = {user_id: build_reminder(events, today) for user_id, events in by_user.items()}
 
-                logger.info(f"Напоминание отправлено пользователю {user_id} о событии {event.id}")
-            except Exception as e:
-                logger.warning(f"❌ Не удалось отправить {user_id}: {e}")
+    async def send(user_id: int):
+        text, kb = reminders[user_id]
+        events = by_user[user_id]
+        photo = photos.get(events[0].id) if len(events) == 1 else None
+        await send_with_fallback(bot, user_id, text, photo, reply_markup=kb)
 
+    report = await broadcaster.run(list(reminders), send)
+    logger.info(
+        f"🔔 Напоминания: {report.sent}/{report.total} пользователям за {report.elapsed:.1f} сек, "
+        f"ошибок {len(report.failed)}"
+    )
+    if report.dead:
+        await orm_deactivate_users(session, report.dead)
+        user_cache.invalidate(*report.dead)
 
 
-async def notify_all_users(bot, session, text: str, img: str | None = None):
+async def notify_all_users(bot, session, text: str, img: str | None = None) -> int:
     """
     Отправка уведомления всем пользователям из таблицы Users
     """
     # достаём всех пользователей
-    result = await session.execute(select(Users.user_id))
+    result = await session.execute(select(Users.user_id).where(Users.is_active == True))
     user_ids = result.scalars().all()
 
-    logger.info(f"📢 Рассылка по {len(user_ids)} пользователям")
-
-    kb_main = InlineKeyboardMarkup(
-        inline_keyboard=[
-            [InlineKeyboardButton(text="🏠 Главное меню", callback_data="main_menu")]
-        ]
-    )
-
-    for user_id in user_ids:
-        try:
-            if img:
-                try:
-                    await bot.send_photo(
-                        user_id,
-                        img,
-                        caption=text[:1024],
-                        parse_mode="HTML",
-                        reply_markup=kb_main,
-                    )
-                except Exception:
-                    await bot.send_message(
-                        user_id,
-                        text[:4096],
-                        parse_mode="HTML",
-                        reply_markup=kb_main,
-                    )
-            else:
-                await bot.send_message(
-                    user_id,
-                    text[:4096],
-                    parse_mode="HTML",
-                    reply_markup=kb_main,
-                )
-        except Exception as e:
-            logger.warning(f"❌ Не удалось отправить сообщение {user_id}: {e}")
-
-
-
-
-#==============================test_send reminders =================================
-
-
-async def send_event_reminders(bot, session):
-    now = datetime.now().date()
-    two_days = now + timedelta(days=2)
-
-    # выбираем события на ближайшие 2 дня
-    result = await session.execute(
-        select(Events).where(Events.date.between(now, two_days))
-    )
-    events = result.scalars().all()
-
-    if not events:
-        logger.info("Нет событий в ближайшие 2 дня")
-        return
-
-    for event in events:
-        # находим пользователей, отслеживающих событие
-        tracking_users = await session.execute(
-            select(UserEventTracking.user_id).where(UserEventTracking.event_id == event.id)
-        )
-        user_ids = tracking_users.scalars().all()
-
-        if not user_ids:
-            continue
-
-        # считаем разницу в днях
-        days_left = (event.date.date() - now).days
-        if days_left < 0:
-            continue
-        elif days_left == 0:
-            text = (
-                f"🔔 Напоминание!\n\n"
-                f"Уже Сегодня состоится мероприятие:\n\n"
-                f"<b>{event.name}</b>\n"
-                f"🗓 {event.date:%d.%m.%Y %H:%M}\n\n"
-                f"{(event.description or '')[:200]}..."
-            )
-        else:
-            text = (
-                f"🔔 Напоминание!\n\n"
-                f"Через {days_left} {'день' if days_left == 1 else 'дней'} состоится мероприятие:\n\n"
-                f"<b>{event.name}</b>\n"
-                f"🗓 {event.date:%d.%m.%Y %H:%M}\n\n"
-                f"{(event.description or '')[:200]}..."
-            )
-
-        # рассылаем уведомления
-        for user_id in user_ids:
-            try:
-                if event.img:
-                    try:
-                        await bot.send_photo(user_id, event.img, caption=text, parse_mode="HTML",reply_markup=InlineKeyboardMarkup(
-                            inline_keyboard=[[InlineKeyboardButton(text="📆Афиша мероприятий",
-                                                                   callback_data=f"event_card:{event.id}:{1}:{int(event.is_free)}")]]))
-                    except Exception:
-                        await bot.send_message(user_id, text, parse_mode="HTML")
-                else:
-                    await bot.send_message(user_id, text, parse_mode="HTML")
-
-                logger.info(f"Напоминание отправлено пользователю {user_id} о событии {event.id}")
-            except Exception as e:
-                logger.warning(f"❌ Не удалось отправить {user_id}: {e}")
\ No newline at end of file
+    broadcast_id = await orm_enqueue_broadcast(session, "all", text, img, user_ids)
+    outbox_dispatcher.wake()
+    logger.info(f"📢 Рассылка #{broadcast_id} по {len(user_ids)} пользователям поставлена в очередь")
+    return broadcast_id
@@ -10,13 +10,6 @@ from database.orm_query import  orm_add_user
 from handlers.menu2 import get_main_menu_kb
 from logic.helper import get_text
 
-#Подгрузка текста
-
-
-
-welcome = get_text("welcome")
-welcome_text = get_text("welcome_text")
-
 
 # ================== ЛОГИРОВАНИЕ ==================
 
@@ -53,14 +46,14 @@ async def start_cmd(message: types.Message, session: AsyncSession):
             ]
         ]
     )
-    await message.answer(f"{welcome}", reply_markup=policy_keyboard, parse_mode="HTML")
+    await message.answer(get_text("welcome"), reply_markup=policy_keyboard, parse_mode="HTML")
 
 
 @user_private_router.callback_query(F.data == "agree_policy")
 async def process_agree(callback: CallbackQuery, session: AsyncSession):
     await callback.answer("Спасибо, вы согласились ✅", show_alert=False)
     logger.info(f"Пользователь {callback.from_user.id} согласился с правилами")
-    await callback.message.answer(welcome_text, reply_markup=await get_main_menu_kb(callback.from_user, session))
+    await callback.message.answer(get_text("welcome_text"), reply_markup=await get_main_menu_kb(callback.from_user, session))
 
 
 @user_private_router.message(Command('check_id'))
@@ -0,0 +1,184 @@
+"""
+Движок массовых рассылок с учётом лимитов Telegram.
+
+Telegram ограничивает бота примерно 30 сообщениями в секунду суммарно
+и одним сообщением в секунду в один чат. Рассылка выполняется пулом
+параллельных отправителей поверх общего token bucket; при `RetryAfter`
+приостанавливается весь пул, а сообщение отправляется повторно.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Iterable
+
+from aiogram.exceptions import TelegramRetryAfter, TelegramForbiddenError, TelegramBadRequest
+
+from logic.media_cache import BroadcastPhoto
+
+
+# ================== ЛОГИРОВАНИЕ ==================
+
+logger = logging.getLogger(__name__)
+
+# ================== НАСТРОЙКИ ==================
+
+GLOBAL_RATE = float(os.getenv("BROADCAST_RATE", "25"))          # сообщений в секунду на весь бот
+PER_CHAT_INTERVAL = float(os.getenv("BROADCAST_CHAT_INTERVAL", "1"))  # секунд между сообщениями в один чат
+WORKERS = int(os.getenv("BROADCAST_WORKERS", "10"))              # параллельных отправителей
+MAX_RETRIES = 3                                                  # повторов после RetryAfter
+
+
+def is_dead_chat_error(error: Exception) -> bool:
+    """
+    Ошибка означает, что писать в чат больше нельзя:
+    бот заблокирован, аккаунт удалён, чат не найден.
+    """
+    if isinstance(error, TelegramForbiddenError):
+        return True
+    return isinstance(error, TelegramBadRequest) and "chat not found" in str(error).lower()
+
+
+class TokenBucket:
+    """Классический token bucket: `rate` токенов в секунду, не больше `capacity` сразу."""
+
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+@dataclass
+class BroadcastResult:
+    """Итог рассылки. `dead` — чаты, куда писать больше нельзя (входят и в `failed`)."""
+    total: int = 0
+    sent: int = 0
+    failed: list[int] = field(default_factory=list)
+    dead: list[int] = field(default_factory=list)
+    elapsed: float = 0.0
+
+
+class Broadcaster:
+    """
+    Пул отправителей с общими лимитами.
+
+    Один экземпляр используется всеми рассылками процесса, чтобы
+    глобальный и поканальный лимиты соблюдались и при нескольких
+    одновременных рассылках (например, новости и афиша после парсинга).
+    """
+
+    def __init__(
+        self,
+        rate: float = GLOBAL_RATE,
+        workers: int = WORKERS,
+        per_chat_interval: float = PER_CHAT_INTERVAL,
+    ) -> None:
+        self.workers = workers
+        self.per_chat_interval = per_chat_interval
+        self._bucket = TokenBucket(rate)
+        self._resume_at = 0.0
+        self._chat_slots: dict[int, float] = {}
+
+    async def run(self, chat_ids: Iterable[int], send: Callable[[int], Awaitable[object]]) -> BroadcastResult:
+        """Отправить `send(chat_id)` каждому чату и дождаться окончания."""
+        queue: asyncio.Queue[int] = asyncio.Queue()
+        for chat_id in chat_ids:
+            queue.put_nowait(chat_id)
+
+        result = BroadcastResult(total=queue.qsize())
+        if not result.total:
+            return result
+
+        started = time.monotonic()
+        workers = [
+            asyncio.create_task(self._worker(queue, send, result))
+            for _ in range(min(self.workers, result.total))
+        ]
+        await asyncio.gather(*workers)
+        result.elapsed = time.monotonic() - started
+        return result
+
+    async def _worker(self, queue: asyncio.Queue, send, result: BroadcastResult) -> None:
+        while True:
+            try:
+                chat_id = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            await self._deliver(chat_id, send, result)
+
+    async def _deliver(self, chat_id: int, send, result: BroadcastResult) -> None:
+        for attempt in range(MAX_RETRIES + 1):
+            await self._wait_pause()
+            await self._wait_chat_slot(chat_id)
+            await self._bucket.acquire()
+            try:
+                await send(chat_id)
+                result.sent += 1
+                return
+            except TelegramRetryAfter as e:
+                self.pause(e.retry_after)
+                logger.warning(
+                    "RetryAfter %s сек. при отправке %s (попытка %d), рассылка приостановлена",
+                    e.retry_after, chat_id, attempt + 1,
+                )
+            except Exception as e:
+                if is_dead_chat_error(e):
+                    logger.info(f"Чат {chat_id} недоступен, пользователь будет отключён от рассылок: {e}")
+                    result.dead.append(chat_id)
+                else:
+                    logger.warning(f"❌ Не удалось отправить сообщение {chat_id}: {e}")
+                result.failed.append(chat_id)
+                return
+
+        logger.warning(f"❌ Сообщение {chat_id} не отправлено: исчерпаны повторы после RetryAfter")
+        result.failed.append(chat_id)
+
+    def pause(self, seconds: float) -> None:
+        """Приостановить весь пул на `seconds` секунд."""
+        self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+    async def _wait_pause(self) -> None:
+        while (delay := self._resume_at - time.monotonic()) > 0:
+            await asyncio.sleep(delay)
+
+    async def _wait_chat_slot(self, chat_id: int) -> None:
+        now = time.monotonic()
+        slot = max(now, self._chat_slots.get(chat_id, 0.0))
+        self._chat_slots[chat_id] = slot + self.per_chat_interval
+        if len(self._chat_slots) > 10_000:
+            self._chat_slots = {k: v for k, v in self._chat_slots.items() if v > now}
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+broadcaster = Broadcaster()
+
+
+async def send_with_fallback(bot, user_id: int, text: str, photo: BroadcastPhoto | None, reply_markup=None):
+    """Отправить фото с подписью, а если фото не принимается — только текст."""
+    if photo and not photo.broken:
+        try:
+            await photo.send(bot, user_id, caption=text[:1024], parse_mode="HTML", reply_markup=reply_markup)
+            return
+        except TelegramRetryAfter:
+            raise
+        except Exception as e:
+            if is_dead_chat_error(e):
+                raise
+            logger.debug(f"Фото не отправлено {user_id}, отправляем текст: {e}")
+    await bot.send_message(user_id, text[:4096], parse_mode="HTML", reply_markup=reply_markup)
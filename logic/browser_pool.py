@@ -0,0 +1,143 @@
+"""
+Общий браузер для Selenium-парсеров.
+
+Вместо запуска и закрытия `uc.Chrome` в каждом парсере держим один
+прогретый процесс и выдаём парсеру отдельную вкладку. Драйвер Selenium
+не рассчитан на работу из нескольких потоков, поэтому вкладки выдаются
+по очереди. Браузер перезапускается после `BROWSER_MAX_USES` вкладок
+или когда его процессы занимают больше `BROWSER_MAX_RSS_MB` памяти,
+и закрывается при остановке бота.
+"""
+
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+import undetected_chromedriver as uc
+
+from logic.scrap_common import chrome_options
+
+
+# ================== ЛОГИРОВАНИЕ ==================
+
+logger = logging.getLogger(__name__)
+
+# ================== НАСТРОЙКИ ==================
+
+MAX_USES = int(os.getenv("BROWSER_MAX_USES", "20"))          # вкладок до перезапуска браузера
+MAX_RSS_MB = int(os.getenv("BROWSER_MAX_RSS_MB", "1500"))    # память всех процессов Chrome
+
+
+def _process_tree_rss_mb(root_pid: int) -> float:
+    """RSS процесса и всех его потомков по /proc (на других ОС — 0)."""
+    children: dict[int, list[int]] = {}
+    rss_pages: dict[int, int] = {}
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return 0.0
+
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                stat = f.read()
+            with open(f"/proc/{entry}/statm") as f:
+                rss_pages[int(entry)] = int(f.read().split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        # поле comm может содержать пробелы, поэтому режем по последней скобке
+        ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        children.setdefault(ppid, []).append(int(entry))
+
+    total, stack = 0, [root_pid]
+    while stack:
+        pid = stack.pop()
+        total += rss_pages.get(pid, 0)
+        stack.extend(children.get(pid, []))
+    return total * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+
+
+class BrowserPool:
+    """Один прогретый Chrome, выдающий вкладки по очереди."""
+
+    def __init__(self, max_uses: int = MAX_USES, max_rss_mb: int = MAX_RSS_MB) -> None:
+        self.max_uses = max_uses
+        self.max_rss_mb = max_rss_mb
+        self._driver: uc.Chrome | None = None
+        self._home: str | None = None
+        self._uses = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def tab(self) -> Iterator[uc.Chrome]:
+        """Выдать драйвер, переключённый на новую пустую вкладку."""
+        with self._lock:
+            driver = self._ensure_driver()
+            try:
+                driver.switch_to.new_window("tab")
+            except Exception as e:
+                logger.warning(f"Браузер не отвечает, перезапускаем: {e}")
+                self._quit()
+                driver = self._ensure_driver()
+                driver.switch_to.new_window("tab")
+
+            try:
+                yield driver
+            finally:
+                self._uses += 1
+                self._release_tab(driver)
+
+    def shutdown(self, timeout: float = 30) -> None:
+        """Закрыть браузер; если парсер ещё работает — ждём его не дольше `timeout` секунд."""
+        locked = self._lock.acquire(timeout=timeout)
+        try:
+            self._quit()
+        finally:
+            if locked:
+                self._lock.release()
+
+    def _ensure_driver(self) -> uc.Chrome:
+        if self._driver is None:
+            self._driver = uc.Chrome(options=chrome_options())
+            self._home = self._driver.current_window_handle
+            self._uses = 0
+            logger.info("🌐 Браузер для парсеров запущен")
+        return self._driver
+
+    def _release_tab(self, driver: uc.Chrome) -> None:
+        try:
+            driver.close()
+            driver.switch_to.window(self._home)
+        except Exception as e:
+            logger.warning(f"Не удалось закрыть вкладку, перезапускаем браузер: {e}")
+            self._quit()
+            return
+
+        if self._uses >= self.max_uses:
+            logger.info(f"Браузер отработал {self._uses} вкладок, перезапускаем")
+            self._quit()
+            return
+
+        pid = getattr(driver, "browser_pid", None)
+        rss = _process_tree_rss_mb(pid) if pid else 0.0
+        if rss > self.max_rss_mb:
+            logger.info(f"Браузер занимает {rss:.0f} МБ (лимит {self.max_rss_mb}), перезапускаем")
+            self._quit()
+
+    def _quit(self) -> None:
+        if self._driver is None:
+            return
+        try:
+            self._driver.quit()
+        except Exception as e:
+            logger.warning(f"Ошибка при закрытии браузера: {e}")
+        self._driver = None
+        self._home = None
+        logger.info("🌐 Браузер для парсеров закрыт")
+
+
+browser_pool = BrowserPool()
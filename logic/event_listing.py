@@ -0,0 +1,75 @@
+"""
+Списки предстоящих событий в памяти процесса.
+
+Для каждой пары (бесплатные/платные, день) один раз читаются id и подписи
+кнопок всех предстоящих событий в порядке показа; листание страниц
+становится срезом списка без обращения к БД. Кэш сбрасывается при смене
+даты и после любых изменений событий (`invalidate` вызывают синхронизация
+с сайтом и админка).
+"""
+
+import logging
+from datetime import date
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.models import Events
+
+
+# ================== ЛОГИРОВАНИЕ ==================
+
+logger = logging.getLogger(__name__)
+
+
+def capitalize_title_safe(s: str) -> str:
+    """Делает первую букву заглавной, корректно обрабатывая кавычки и ёлочки."""
+    if not s:
+        return s
+    if s[0] in {"«", "\""} and len(s) > 1:
+        return f"{s[0]}{s[1:].capitalize()}"
+    return s.capitalize()
+
+
+def event_button_label(event) -> str:
+    """Подпись кнопки события в списке: дата | название | возраст."""
+    title = capitalize_title_safe(event.name[:30]) if event.title == '' else event.title[:30]
+    return f"🗓 {event.date:%d.%m} | {title} | {event.age_limits}+"
+
+
+class EventListingCache:
+    def __init__(self) -> None:
+        self._day: date | None = None
+        self._lists: dict[tuple[bool, date], list[tuple[int, str]]] = {}
+        # растёт при каждом invalidate: результат чтения, начатого до сброса, не сохраняется
+        self._generation = 0
+
+    async def get(self, session: AsyncSession, is_free: bool) -> list[tuple[int, str]]:
+        """(id, подпись) предстоящих событий по дате; при промахе — один SELECT."""
+        today = date.today()
+        if self._day != today:
+            self.invalidate()
+            self._day = today
+
+        key = (is_free, today)
+        entries = self._lists.get(key)
+        if entries is None:
+            generation = self._generation
+            result = await session.execute(
+                select(Events.id, Events.date, Events.name, Events.title, Events.age_limits)
+                .where(Events.date >= today, Events.is_free == is_free)
+                .order_by(Events.date.asc(), Events.id)
+            )
+            entries = [(row.id, event_button_label(row)) for row in result]
+            if generation == self._generation:
+                self._lists[key] = entries
+            logger.debug(f"Список событий is_free={is_free} на {today}: {len(entries)}")
+        return entries
+
+    def invalidate(self) -> None:
+        """События изменились — перечитать списки при следующем показе."""
+        self._generation += 1
+        self._lists.clear()
+
+
+event_listing = EventListingCache()
@@ -1,4 +1,7 @@
+import asyncio
 import json
+import logging
+import os
 from pathlib import Path
 
 from aiogram import Bot
@@ -6,6 +9,10 @@ from aiogram.types import InlineKeyboardMarkup
 import re
 
 
+# ================== ЛОГИРОВАНИЕ ==================
+
+logger = logging.getLogger(__name__)
+
 
 def is_valid_url(url: str) -> bool:
     """Простая проверка, что ссылка похожа на валидную картинку"""
@@ -153,17 +160,90 @@ async def safe_edit_message(message: types.Message, text: str, kb: InlineKeyboar
             logger.error("Не удалось отправить новое сообщение: %s", inner_e)
 
 
+# ================== ТЕКСТЫ ==================
+
 TEXTS_PATH = Path("texts.json")
+TEXTS_CHECK_INTERVAL = float(os.getenv("TEXTS_CHECK_INTERVAL", "10"))  # секунд между проверками mtime
+
+
+class TextStore:
+    """
+    texts.json в памяти: файл читается один раз, дальше тексты отдаются из словаря.
+    После `save` словарь обновляется сразу; правка файла вручную подхватывается
+    фоновой проверкой mtime. Чтение и запись файла идут в отдельном потоке.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._texts: dict | None = None
+        self._mtime: float | None = None
+        self._task: asyncio.Task | None = None
+
+    def _read(self) -> tuple[dict, float]:
+        mtime = self.path.stat().st_mtime
+        with open(self.path, encoding="utf-8") as f:
+            return json.load(f), mtime
+
+    def _write(self, data: dict) -> float:
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.path)
+        return self.path.stat().st_mtime
+
+    @property
+    def texts(self) -> dict:
+        if self._texts is None:
+            # до load() (например, из скрипта) — один синхронный доступ к файлу
+            self._texts, self._mtime = self._read()
+        return self._texts
+
+    async def load(self) -> None:
+        self._texts, self._mtime = await asyncio.to_thread(self._read)
+
+    async def save(self, data: dict) -> None:
+        self._mtime = await asyncio.to_thread(self._write, data)
+        self._texts = dict(data)
+
+    async def reload_if_changed(self) -> bool:
+        mtime = (await asyncio.to_thread(self.path.stat)).st_mtime
+        if mtime == self._mtime:
+            return False
+        await self.load()
+        logger.info(f"🔁 {self.path} изменён, тексты перечитаны")
+        return True
+
+    def start(self) -> None:
+        if self._task and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._watch())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(TEXTS_CHECK_INTERVAL)
+            try:
+                await self.reload_if_changed()
+            except Exception as e:
+                logger.warning(f"Не удалось перечитать {self.path}, остаются прежние тексты: {e}")
+
+
+text_store = TextStore(TEXTS_PATH)
 
 
-def load_texts():
-    with open(TEXTS_PATH, encoding="utf-8") as f:
-        return json.load(f)
+def load_texts() -> dict:
+    return dict(text_store.texts)
 
 def get_text(key: str) -> str:
-    texts = load_texts()
-    return texts.get(key, "")
+    return text_store.texts.get(key, "")
 
-def save_texts(data: dict):
-    with open(TEXTS_PATH, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
\ No newline at end of file
+async def save_texts(data: dict):
+    await text_store.save(data)
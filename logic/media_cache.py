@@ -0,0 +1,135 @@
+"""
+Кэш картинок для рассылок.
+
+Картинка с сайта скачивается один раз, загружается в Telegram первому
+получателю, а полученный `file_id` сохраняется в таблицу `media_cache`
+(ключ — ссылка + sha256 содержимого). Остальные получатели и следующие
+рассылки с той же картинкой отправляются по `file_id`, и Telegram
+не скачивает ссылку заново для каждого пользователя.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+from urllib.parse import urlparse, unquote
+
+import aiohttp
+from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import BufferedInputFile, Message
+
+from database.engine import Session
+from database.orm_query import orm_get_media_file_id, orm_save_media_file_id
+
+
+# ================== ЛОГИРОВАНИЕ ==================
+
+logger = logging.getLogger(__name__)
+
+# ================== НАСТРОЙКИ ==================
+
+DOWNLOAD_TIMEOUT = 30
+MAX_PHOTO_SIZE = 10 * 1024 * 1024  # лимит Telegram на загрузку фото
+
+# (url, content_hash) -> file_id, чтобы не ходить в БД на каждую рассылку
+_known: dict[tuple[str, str], str] = {}
+
+
+class BroadcastPhoto:
+    """Картинка рассылки: в Telegram загружается один раз, дальше уходит по file_id."""
+
+    def __init__(self, url: str, data: bytes | None = None, content_hash: str | None = None,
+                 file_id: str | None = None) -> None:
+        self.url = url
+        self.content_hash = content_hash
+        self.file_id = file_id
+        self.broken = False
+        self._data = data
+        self._lock = asyncio.Lock()
+
+    def _upload_source(self):
+        if self._data is not None:
+            filename = os.path.basename(unquote(urlparse(self.url).path)) or "photo.jpg"
+            return BufferedInputFile(self._data, filename=filename)
+        # скачать не удалось — отдаём ссылку, как раньше
+        return self.url
+
+    async def send(self, bot: Bot, chat_id: int, **kwargs) -> Message:
+        """Отправить фото; первая успешная отправка запоминает file_id."""
+        if self.file_id is None:
+            async with self._lock:
+                if self.broken:
+                    raise RuntimeError(f"Telegram не принимает картинку {self.url}")
+                if self.file_id is None:
+                    return await self._upload(bot, chat_id, **kwargs)
+        return await bot.send_photo(chat_id, self.file_id, **kwargs)
+
+    async def _upload(self, bot: Bot, chat_id: int, **kwargs) -> Message:
+        # logic.broadcast сам импортирует этот модуль
+        from logic.broadcast import is_dead_chat_error
+
+        try:
+            message = await bot.send_photo(chat_id, self._upload_source(), **kwargs)
+        except TelegramBadRequest as e:
+            # ошибка получателя (чат удалён, нет прав) — картинку пробуем со следующим;
+            # ошибки самой картинки повторять бессмысленно
+            if not (is_dead_chat_error(e) or "chat" in str(e).lower()):
+                self.broken = True
+            raise
+
+        self.file_id = message.photo[-1].file_id
+        self._data = None
+        if self.content_hash:
+            _known[(self.url, self.content_hash)] = self.file_id
+            try:
+                async with Session() as session:
+                    await orm_save_media_file_id(session, self.url, self.content_hash, self.file_id)
+            except Exception as e:
+                logger.warning(f"Не удалось сохранить file_id для {self.url}: {e}")
+        logger.info(f"Картинка {self.url} загружена в Telegram, дальше отправляется по file_id")
+        return message
+
+
+async def _download(url: str) -> bytes | None:
+    timeout = aiohttp.ClientTimeout(total=DOWNLOAD_TIMEOUT)
+    try:
+        async with aiohttp.ClientSession(timeout=timeout) as http:
+            async with http.get(url) as response:
+                response.raise_for_status()
+                chunks, size = [], 0
+                async for chunk in response.content.iter_chunked(64 * 1024):
+                    size += len(chunk)
+                    if size > MAX_PHOTO_SIZE:
+                        logger.warning(f"Картинка {url} больше {MAX_PHOTO_SIZE} байт, отправляем ссылкой")
+                        return None
+                    chunks.append(chunk)
+    except Exception as e:
+        logger.warning(f"Не удалось скачать картинку {url}: {e}")
+        return None
+    return b"".join(chunks)
+
+
+async def prepare_photo(url: str | None) -> BroadcastPhoto | None:
+    """Подготовить картинку к рассылке: найти сохранённый file_id или скачать её."""
+    if not url:
+        return None
+
+    data = await _download(url)
+    if data is None:
+        return BroadcastPhoto(url)
+
+    content_hash = hashlib.sha256(data).hexdigest()
+    file_id = _known.get((url, content_hash))
+    if file_id is None:
+        try:
+            async with Session() as session:
+                file_id = await orm_get_media_file_id(session, url, content_hash)
+        except Exception as e:
+            logger.warning(f"Не удалось прочитать кэш картинок: {e}")
+        if file_id:
+            _known[(url, content_hash)] = file_id
+
+    if file_id:
+        return BroadcastPhoto(url, content_hash=content_hash, file_id=file_id)
+    return BroadcastPhoto(url, data=data, content_hash=content_hash)
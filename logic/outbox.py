@@ -0,0 +1,149 @@
+"""
+Очередь рассылок (outbox).
+
+Рассылка сначала записывается в БД: строка в `broadcasts` и по строке
+в `broadcast_outbox` на каждого получателя. Фоновый диспетчер забирает
+pending-строки пачками, отправляет их через общий `broadcaster` и
+проставляет статусы одной командой на пачку. После перезапуска бота
+диспетчер продолжает с первой неотправленной строки; повторно может
+уйти не больше одной пачки, прерванной на середине.
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+
+from aiogram import Bot
+from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
+
+from database.engine import Session
+from database.orm_query import (
+    orm_get_outbox_batch,
+    orm_get_broadcasts,
+    orm_set_outbox_status,
+    orm_finish_broadcasts,
+    orm_deactivate_users,
+)
+from logic.broadcast import broadcaster, send_with_fallback
+from logic.media_cache import BroadcastPhoto, prepare_photo
+from logic.user_activity import user_cache
+
+
+# ================== ЛОГИРОВАНИЕ ==================
+
+logger = logging.getLogger(__name__)
+
+# ================== НАСТРОЙКИ ==================
+
+BATCH_SIZE = 200
+POLL_INTERVAL = 30  # секунд между проверками очереди, если никто не разбудил
+
+BROADCAST_KEYBOARDS = {
+    "news": InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(text="🗞 К Новостям", callback_data="list_news")]
+    ]),
+    "events": InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(text="🗓 К Афише мероприятий", callback_data="events_new_message")]
+    ]),
+    "all": InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(text="🏠 Главное меню", callback_data="main_menu")]
+    ]),
+}
+
+
+class OutboxDispatcher:
+    """Фоновая задача, которая разбирает очередь рассылок."""
+
+    def __init__(self) -> None:
+        self._bot: Bot | None = None
+        self._task: asyncio.Task | None = None
+        self._wakeup = asyncio.Event()
+        self._photos: dict[int, BroadcastPhoto | None] = {}
+
+    def start(self, bot: Bot) -> None:
+        if self._task and not self._task.done():
+            return
+        self._bot = bot
+        self._task = asyncio.create_task(self._run())
+        logger.info("📬 Диспетчер рассылок запущен")
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info("📭 Диспетчер рассылок остановлен")
+
+    def wake(self) -> None:
+        """Сообщить диспетчеру, что в очереди появились новые строки."""
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                drained = await self._drain_batch()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception(f"Ошибка диспетчера рассылок: {e}")
+                drained = False
+
+            if not drained:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+
+    async def _drain_batch(self) -> bool:
+        async with Session() as session:
+            rows = await orm_get_outbox_batch(session, BATCH_SIZE)
+            if not rows:
+                return False
+
+            by_broadcast: dict[int, list[tuple[int, int]]] = defaultdict(list)
+            for outbox_id, broadcast_id, user_id in rows:
+                by_broadcast[broadcast_id].append((outbox_id, user_id))
+            broadcasts = {b.id: b for b in await orm_get_broadcasts(session, list(by_broadcast))}
+
+            sent_ids, failed_ids, dead_users = [], [], []
+            for broadcast_id, items in by_broadcast.items():
+                broadcast = broadcasts.get(broadcast_id)
+                if broadcast is None:
+                    failed_ids.extend(outbox_id for outbox_id, _ in items)
+                    continue
+
+                if broadcast_id not in self._photos:
+                    self._photos[broadcast_id] = await prepare_photo(broadcast.img)
+                photo = self._photos[broadcast_id]
+                kb = BROADCAST_KEYBOARDS.get(broadcast.kind)
+
+                report = await broadcaster.run(
+                    [user_id for _, user_id in items],
+                    lambda user_id: send_with_fallback(self._bot, user_id, broadcast.text, photo, reply_markup=kb),
+                )
+                dead_users.extend(report.dead)
+                failed = set(report.failed)
+                for outbox_id, user_id in items:
+                    (failed_ids if user_id in failed else sent_ids).append(outbox_id)
+                logger.info(
+                    f"📢 Рассылка #{broadcast_id}: пачка {report.sent}/{report.total} за {report.elapsed:.1f} сек"
+                )
+
+            await orm_set_outbox_status(session, sent_ids, "sent")
+            await orm_set_outbox_status(session, failed_ids, "failed")
+            for broadcast_id in await orm_finish_broadcasts(session, list(by_broadcast)):
+                self._photos.pop(broadcast_id, None)
+                logger.info(f"✅ Рассылка #{broadcast_id} завершена")
+            await session.commit()
+            if dead_users:
+                await orm_deactivate_users(session, dead_users)
+                user_cache.invalidate(*dead_users)
+                logger.info(f"🚫 Отключено от рассылок пользователей: {len(dead_users)}")
+        return True
+
+
+outbox_dispatcher = OutboxDispatcher()
@@ -0,0 +1,108 @@
+"""
+Общие части парсеров сайта ДК «Яуза»: адреса страниц, разбор дат,
+возрастных ограничений и стоимости, настройки Chrome для Selenium.
+"""
+
+import hashlib
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import undetected_chromedriver as uc
+from selenium.webdriver.common.by import By
+
+
+# ================== АДРЕСА ==================
+
+BASE_URL = "https://xn----8sbknn9c9d.xn--p1ai"   # дк-яуза.рф
+EVENTS_URL = f"{BASE_URL}/afisha/"
+NEWS_URL = f"{BASE_URL}/novosti/"
+STUDIOS_URL = f"{BASE_URL}/studii/"
+
+MONTHS = {
+    "ЯНВ": 1, "ФЕВ": 2, "МАР": 3, "АПР": 4,
+    "МАЙ": 5, "ИЮН": 6, "ИЮЛ": 7, "АВГ": 8,
+    "СЕН": 9, "ОКТ": 10, "НОЯ": 11, "ДЕК": 12,
+}
+
+
+@dataclass
+class ScrapeOutput:
+    """
+    Результат парсинга раздела.
+    data — {название: [поля]} в прежнем формате, log — текстовый отчёт,
+    fingerprints — {название: отпечаток карточки}, skipped — отпечатки
+    карточек, пропущенных без изменений, errors — число ошибок.
+    categories — {название: категории} по вкладкам списка (только студии)
+    для всех карточек, в том числе пропущенных: вкладка не входит
+    в отпечаток, поэтому перенос студии в другую категорию виден только здесь.
+    """
+    data: dict
+    log: str
+    fingerprints: dict[str, str] = field(default_factory=dict)
+    skipped: set[str] = field(default_factory=set)
+    errors: int = 0
+    categories: dict[str, str] = field(default_factory=dict)
+
+
+def card_fingerprint(href: str | None, text: str | None, img: str | None) -> str:
+    """Отпечаток карточки списка: ссылка на описание, текст карточки и картинка."""
+    raw = "\x1f".join(" ".join((part or "").split()) for part in (href, text, img))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def selenium_card_fingerprint(item, href: str | None) -> str:
+    """`card_fingerprint` для карточки, найденной через Selenium."""
+    images = item.find_elements(By.TAG_NAME, 'img')
+    img = images[0].get_attribute('src') if images else ''
+    return card_fingerprint(href, item.text, img)
+
+
+def skipped_line(skipped: set[str]) -> str:
+    return f"\nБез изменений (пропущено): {len(skipped)}" if skipped else ""
+
+
+def find_age_limits(text: str) -> int:
+    try:
+        matches = re.findall(r"\(\+?(\d{1,2})\+?\)", text)
+        return [int(m) for m in matches][0]
+    except:
+        return 0
+
+
+def extract_numbers(text: str) -> list[int]:
+    """
+    Извлекает все целые числа из строки.
+    Возвращает список int.
+    """
+    # \d+ — одна или несколько цифр
+    numbers = re.findall(r'\d+', str(text))
+    # конвертируем в int
+    return [int(num) for num in numbers] if numbers else []
+
+
+def parse_event_date(event_date: str, event_time: str) -> str:
+    """'ОКТ 18, 2025' + '19:00' → '2025-10-18 19:00' (формат, который ждёт sync_service)."""
+    mon, day, year = event_date.replace(',', '').split()
+    hour, minutes = event_time.strip().split(':')
+    date = datetime(int(year), MONTHS[mon.upper()], int(day), int(hour), int(minutes))
+    return date.strftime("%Y-%m-%d %H:%M")
+
+
+def split_cost(cost_text) -> tuple[int, int | None]:
+    """Стоимость студии: первое число — цена, второе (если есть) — дополнительная."""
+    numbers = extract_numbers(str(cost_text))
+    if not numbers:
+        return 0, None
+    second_cost = numbers[1] if len(numbers) > 1 else None
+    return numbers[0], second_cost
+
+
+def chrome_options() -> uc.ChromeOptions:
+    options = uc.ChromeOptions()
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--disable-software-rasterizer")
+    options.add_argument("--headless=new")
+    return options
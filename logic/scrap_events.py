@@ -3,62 +3,70 @@ from selenium.webdriver.chrome.options import Options
 import time
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from datetime import datetime
-import re
-import undetected_chromedriver as uc
+from selenium.common.exceptions import TimeoutException
 
+from logic.browser_pool import browser_pool
+from logic.scrap_common import (
+    EVENTS_URL, ScrapeOutput, find_age_limits, parse_event_date, selenium_card_fingerprint, skipped_line,
+)
+from logic.single_flight import report_progress
+from logic.waits import Waiter, MODAL, page_loaded, items_settled, text_changed, nothing_visible, displayed, current_text
 
-def find_age_limits(text: str) -> int:
-    try:
-        matches = re.findall(r"\(\+?(\d{1,2})\+?\)", text)
-        return [int(m) for m in matches][0]
-    except:
-        return 0
 
+def update_all_events(driver=None, known: set[str] = frozenset()) -> ScrapeOutput:
+    """known — отпечатки карточек, которые уже есть в БД: их окна не открываются."""
+    if driver is None:
+        with browser_pool.tab() as driver:
+            return update_all_events(driver, known)
 
-def update_all_events():
-    url = "https://xn----8sbknn9c9d.xn--p1ai/afisha/"
+    url = EVENTS_URL
 
 
     start_time = time.time()
-    options = uc.ChromeOptions()
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--disable-software-rasterizer")
-    options.add_argument("--headless=new")
-
-    # driver = uc.Chrome(options=options, version_main=139)
-    driver = uc.Chrome(options=options)
-
+    waiter = Waiter(driver)
 
     driver.get(url)
-    time.sleep(4)
+    waiter.until("загрузка страницы", page_loaded)
     error_text = ''
     driver.execute_script("window.scrollTo(0, document.body.scrollHeight)")
-    time.sleep(4)
+    waiter.until("подгрузка карточек", items_settled((By.CSS_SELECTOR, '.tabs-content .b-event__slide-item')), required=False)
 
-    data = {}
+    data, fingerprints, skipped = {}, {}, set()
     error_counter = 0
     items = driver.find_element(By.CLASS_NAME, 'tabs-content').find_element(By.CLASS_NAME, 'flex').find_elements(
         By.CLASS_NAME, 'b-event__slide-item')
-    driver.execute_script("arguments[0].scrollIntoView(true);", items[0])
-    time.sleep(2)
-    for item in items:
+    for number, item in enumerate(items):
+        report_progress(number, len(items))
+        # заголовок прошлой карточки читается, пока окно ещё открыто
+        previous = current_text(driver, MODAL)
         driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.ESCAPE)
+        waiter.until("закрытие окна", nothing_visible(MODAL), timeout=2, required=False)
         driver.execute_script("arguments[0].scrollIntoView(true);", item)
-        time.sleep(1)
+        waiter.until("прокрутка к карточке", displayed(item), required=False)
         try:
             is_free = (item.find_element(By.CLASS_NAME, 'text-is-payable').text.lower() == 'бесплатно')
         except:
             is_free = False
         try:
-            item.find_elements(By.TAG_NAME, 'a')[0].click()
+            card_link = item.find_elements(By.TAG_NAME, 'a')[0]
+            fingerprint = selenium_card_fingerprint(item, card_link.get_attribute('href'))
+        except Exception as e:
+            error_text += f'{e}\n'
+            continue
+        if fingerprint in known:
+            skipped.add(fingerprint)
+            continue
+        try:
+            card_link.click()
+            waiter.until("открытие окна", text_changed(MODAL, previous))
+        except TimeoutException as e:
+            error_counter += 1
+            error_text += f'{e.msg}\n'
+            continue
         except Exception as e:
             # print('error')
             error_text += f'{e}\n'
             continue
-        time.sleep(2)
         try:
             main_info = driver.find_element(By.ID, 'hidden-content-2')
 
@@ -75,18 +83,11 @@ def update_all_events():
             except:
                 link = ''
 
-            month = {
-                "ЯНВ": 1, "ФЕВ": 2, "МАР": 3, "АПР": 4,
-                "МАЙ": 5, "ИЮН": 6, "ИЮЛ": 7, "АВГ": 8,
-                "СЕН": 9, "ОКТ": 10, "НОЯ": 11, "ДЕК": 12,
-            }
-            mon, day, year = event_date.replace(',', '').split(' ')
-            hour, minutes = event_time.split(':')
-            date = datetime(int(year), int(month[mon.upper()]), int(day), int(hour), int(minutes))
-            date_str = f'{str(year)}-{str(month[mon.upper()])}-{str(day)} {str(hour)}:{str(minutes)}'
+            date_str = parse_event_date(event_date, event_time)
             # information = [date, description, img, link]
             information = [date_str, description,age_limit, img, link, is_free]
             data[name] = information
+            fingerprints[name] = fingerprint
 
         except Exception as e:
             error_counter += 1
@@ -94,8 +95,8 @@ def update_all_events():
     end_time = time.time()
     elapsed_time = end_time - start_time
     text = f"Обновление завершено за {round(elapsed_time)} сек\n"
+    text += skipped_line(skipped)
     if error_counter > 0:
         text += f"При обновлении было пропущено {error_counter} мероприятий со следующими ошибками:\n{error_text}"
-    driver.close()
-    driver.quit()
-    return data, text
\ No newline at end of file
+    text += f"\n{waiter.report()}"
+    return ScrapeOutput(data, text, fingerprints, skipped, error_counter)
\ No newline at end of file
@@ -0,0 +1,84 @@
+"""
+Выбор способа парсинга сайта.
+
+SCRAPER_MODE=http (по умолчанию) — быстрый парсер без браузера
+(`logic.scrap_http`); если он упал или ничего не нашёл, автоматически
+запускается Selenium. SCRAPER_MODE=selenium — только браузер, как раньше.
+Все функции возвращают `ScrapeOutput`; `known` — отпечатки карточек,
+уже сохранённых в БД, такие карточки пропускаются.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Awaitable, Callable
+
+from logic import scrap_http
+from logic.scrap_common import ScrapeOutput
+from logic.scrap_events import update_all_events
+from logic.scrap_news import update_all_news
+from logic.scrap_studios import update_all_studios
+
+
+# ================== ЛОГИРОВАНИЕ ==================
+
+logger = logging.getLogger(__name__)
+
+# ================== НАСТРОЙКИ ==================
+
+SCRAPER_MODE = os.getenv("SCRAPER_MODE", "http").lower()  # "http" | "selenium"
+# 0 — всегда перечитывать все карточки, не глядя на сохранённые отпечатки
+INCREMENTAL = os.getenv("SCRAPER_INCREMENTAL", "1") != "0"
+
+
+async def _fetch(
+    section: str,
+    http_fetcher: Callable[[set[str]], Awaitable[ScrapeOutput]],
+    selenium_fetcher: Callable[..., ScrapeOutput],
+    known: set[str],
+    complete: Callable[[ScrapeOutput], bool] = lambda output: True,
+) -> ScrapeOutput:
+    """
+    complete — хватает ли результата HTTP-парсера; если нет, запускается
+    Selenium, а при его ошибке остаётся неполный результат HTTP-парсера.
+    """
+    if not INCREMENTAL:
+        known = frozenset()
+
+    partial = None
+    if SCRAPER_MODE != "selenium":
+        try:
+            output = await http_fetcher(known)
+            if not (output.data or output.skipped):
+                logger.warning(f"HTTP-парсер ({section}) ничего не нашёл, запускаем Selenium")
+            elif complete(output):
+                return output
+            else:
+                partial = output
+                logger.warning(f"HTTP-парсер ({section}) вернул неполные данные, запускаем Selenium")
+        except Exception as e:
+            logger.warning(f"HTTP-парсер ({section}) завершился с ошибкой, запускаем Selenium: {e}")
+
+    try:
+        return await asyncio.to_thread(selenium_fetcher, None, known)
+    except Exception as e:
+        if partial is None:
+            raise
+        logger.warning(f"Selenium ({section}) завершился с ошибкой, используем данные HTTP-парсера: {e}")
+        return partial
+
+
+async def fetch_events(known: set[str] = frozenset()) -> ScrapeOutput:
+    return await _fetch("афиша", scrap_http.fetch_events, update_all_events, known)
+
+
+async def fetch_news(known: set[str] = frozenset()) -> ScrapeOutput:
+    return await _fetch("новости", scrap_http.fetch_news, update_all_news, known)
+
+
+async def fetch_studios(known: set[str] = frozenset()) -> ScrapeOutput:
+    # без категорий (вкладки пустые в HTML) студии читает браузер
+    return await _fetch(
+        "студии", scrap_http.fetch_studios, update_all_studios, known,
+        complete=lambda output: bool(output.categories),
+    )
@@ -0,0 +1,347 @@
+"""
+Парсер сайта без браузера.
+
+Карточки на страницах афиши, новостей и студий — ссылки `js-load-info`,
+по которым сайт подгружает HTML модального окна. Здесь эти ссылки
+запрашиваются напрямую через aiohttp (параллельно, с ограничением),
+а разметка разбирается lxml по тем же классам, что и в Selenium-парсерах.
+Результат — `ScrapeOutput`, как у `update_all_*`. Карточки, отпечаток
+которых есть в `known`, пропускаются без запроса модального окна.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from urllib.parse import urljoin
+
+import aiohttp
+from lxml import html
+
+from logic.scrap_common import (
+    EVENTS_URL, NEWS_URL, STUDIOS_URL, ScrapeOutput,
+    card_fingerprint, skipped_line, find_age_limits, parse_event_date, split_cost,
+)
+from logic.single_flight import report_progress
+
+
+# ================== ЛОГИРОВАНИЕ ==================
+
+logger = logging.getLogger(__name__)
+
+# ================== НАСТРОЙКИ ==================
+
+HTTP_CONCURRENCY = int(os.getenv("SCRAPER_HTTP_CONCURRENCY", "8"))  # одновременных запросов к сайту
+HTTP_TIMEOUT = int(os.getenv("SCRAPER_HTTP_TIMEOUT", "20"))          # секунд на один запрос
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/139.0 Safari/537.36"
+    ),
+    "Accept-Language": "ru-RU,ru;q=0.9",
+}
+# модальные окна сайт отдаёт на AJAX-запрос
+AJAX_HEADERS = {"X-Requested-With": "XMLHttpRequest"}
+
+BLOCK_TAGS = {"p", "div", "br", "li", "ul", "ol", "tr", "h1", "h2", "h3", "h4", "h5", "h6"}
+SKIP_TAGS = {"script", "style", "noscript"}
+
+
+# ================== РАЗБОР HTML ==================
+
+def _class_xpath(*classes: str) -> str:
+    return " and ".join(
+        f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')" for cls in classes
+    )
+
+
+def find_all(node, class_name: str) -> list:
+    """Все потомки с классом (или классами через точку, как в By.CLASS_NAME)."""
+    return node.xpath(f".//*[{_class_xpath(*class_name.split('.'))}]")
+
+
+def find(node, class_name: str):
+    found = find_all(node, class_name)
+    if not found:
+        raise LookupError(f"не найден элемент .{class_name}")
+    return found[0]
+
+
+def element_text(node) -> str:
+    """Текст элемента с переносами строк между блоками — как `.text` в Selenium."""
+    parts: list[str] = []
+
+    def walk(el) -> None:
+        tag = el.tag if isinstance(el.tag, str) else ""
+        if tag not in SKIP_TAGS:
+            if tag in BLOCK_TAGS:
+                parts.append("\n")
+            if tag and el.text:
+                parts.append(el.text)
+            for child in el:
+                walk(child)
+            if tag in BLOCK_TAGS:
+                parts.append("\n")
+        if el.tail:
+            parts.append(el.tail)
+
+    tail, node.tail = node.tail, None
+    try:
+        walk(node)
+    finally:
+        node.tail = tail
+
+    lines = (" ".join(line.split()) for line in "".join(parts).splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def attr(node, tag: str, name: str, base_url: str) -> str:
+    """Атрибут первого тега `tag` внутри node; ссылки приводятся к абсолютным."""
+    found = node.xpath(f".//{tag}[@{name}]")
+    if not found:
+        raise LookupError(f"не найден <{tag} {name}>")
+    return urljoin(base_url, found[0].get(name).strip())
+
+
+def _modal(document):
+    """Содержимое модального окна: #hidden-content-2, если сайт вернул обёртку целиком."""
+    found = document.xpath("//*[@id='hidden-content-2']")
+    return found[0] if found else document
+
+
+def _card_fingerprint(item, link: str, base_url: str) -> str:
+    images = item.xpath(".//img[@src]")
+    img = urljoin(base_url, images[0].get("src").strip()) if images else ""
+    return card_fingerprint(link, element_text(item), img)
+
+
+def _info_link(item, base_url: str) -> str | None:
+    for link in find_all(item, "js-load-info") + item.xpath(".//a[@href]"):
+        href = link.get("href") or link.get("data-href") or link.get("data-src")
+        if href and not href.startswith(("#", "javascript")):
+            return urljoin(base_url, href)
+    return None
+
+
+# ================== ЗАГРУЗКА ==================
+
+class _Fetcher:
+    """HTTP-сессия с общим лимитом параллельных запросов."""
+
+    def __init__(self, http: aiohttp.ClientSession) -> None:
+        self.http = http
+        self._semaphore = asyncio.Semaphore(HTTP_CONCURRENCY)
+
+    async def page(self, url: str, ajax: bool = False):
+        async with self._semaphore:
+            async with self.http.get(url, headers=AJAX_HEADERS if ajax else None) as response:
+                response.raise_for_status()
+                content = await response.text(errors="replace")
+        return html.document_fromstring(content, base_url=url)
+
+    async def modals(self, urls: list[str]) -> list:
+        """Загрузить модальные окна; на месте неудачных — исключения."""
+        loaded = 0
+
+        async def load(url: str):
+            nonlocal loaded
+            try:
+                return await self.page(url, ajax=True)
+            finally:
+                loaded += 1
+                report_progress(loaded, len(urls))
+
+        return await asyncio.gather(*(load(url) for url in urls), return_exceptions=True)
+
+
+def _session() -> aiohttp.ClientSession:
+    return aiohttp.ClientSession(headers=HEADERS, timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT))
+
+
+def _report(start_time: float, what: str, errors: list[str], skipped: set[str]) -> str:
+    text = f"Обновление завершено за {round(time.time() - start_time)} сек"
+    text += skipped_line(skipped)
+    if errors:
+        text += f"\nПри обновлении было пропущено {len(errors)} {what} со следующими ошибками:\n" + "\n".join(errors)
+    return text
+
+
+# ================== АФИША ==================
+
+async def fetch_events(known: set[str] = frozenset()) -> ScrapeOutput:
+    start_time = time.time()
+    data, fingerprints, skipped, errors = {}, {}, set(), []
+
+    async with _session() as http:
+        fetcher = _Fetcher(http)
+        page = await fetcher.page(EVENTS_URL)
+        items = find_all(find(find(page, "tabs-content"), "flex"), "b-event__slide-item")
+
+        cards = []
+        for item in items:
+            payable = find_all(item, "text-is-payable")
+            is_free = bool(payable) and element_text(payable[0]).lower() == "бесплатно"
+            link = _info_link(item, EVENTS_URL)
+            if link is None:
+                errors.append("у карточки нет ссылки на описание")
+                continue
+            fingerprint = _card_fingerprint(item, link, EVENTS_URL)
+            if fingerprint in known:
+                skipped.add(fingerprint)
+                continue
+            cards.append((link, is_free, fingerprint))
+
+        modals = await fetcher.modals([link for link, _, _ in cards])
+
+    for (link, is_free, fingerprint), modal in zip(cards, modals):
+        try:
+            if isinstance(modal, Exception):
+                raise modal
+            info = _modal(modal)
+            name = element_text(find(info, "title"))
+            event_date = element_text(find(info, "modal_more_calendar").xpath(".//span")[0])
+            event_time = element_text(find(info, "modal_more_time").xpath(".//span")[0])
+            description = element_text(find(info, "modal_more_text"))
+            img = attr(find(info, "modal_more_image"), "img", "src", link)
+            buy_buttons = find_all(info, "button-link.abiframelnk")
+            href = buy_buttons[0].get("href") if buy_buttons else None
+            buy_link = urljoin(link, href) if href else ''
+
+            date_str = parse_event_date(event_date, event_time)
+            data[name] = [date_str, description, find_age_limits(description), img, buy_link, is_free]
+            fingerprints[name] = fingerprint
+        except Exception as e:
+            errors.append(f"{link}: {e}")
+
+    log = _report(start_time, "мероприятий", errors, skipped)
+    return ScrapeOutput(data, log, fingerprints, skipped, len(errors))
+
+
+# ================== НОВОСТИ ==================
+
+async def fetch_news(known: set[str] = frozenset()) -> ScrapeOutput:
+    start_time = time.time()
+    data, fingerprints, skipped, errors = {}, {}, set(), []
+
+    async with _session() as http:
+        fetcher = _Fetcher(http)
+        page = await fetcher.page(NEWS_URL)
+        items = find_all(find(find(page, "progress.news"), "flex"), "b-event__slide-item.news_block")
+
+        # как и в Selenium-парсере: от старых к новым
+        cards = []
+        for item in items[::-1]:
+            link = _info_link(item, NEWS_URL)
+            if link is None:
+                errors.append("у карточки нет ссылки на новость")
+                continue
+            fingerprint = _card_fingerprint(item, link, NEWS_URL)
+            if fingerprint in known:
+                skipped.add(fingerprint)
+                continue
+            cards.append((link, fingerprint))
+
+        modals = await fetcher.modals([link for link, _ in cards])
+
+    for (link, fingerprint), modal in zip(cards, modals):
+        try:
+            if isinstance(modal, Exception):
+                raise modal
+            info = _modal(modal)
+            title = element_text(find(info, "title"))
+            img = attr(find(info, "column-left"), "img", "src", link)
+            description = element_text(find(info, "modal_more_text"))
+            data[title] = [description, img]
+            fingerprints[title] = fingerprint
+        except Exception as e:
+            errors.append(f"{link}: {e}")
+
+    log = _report(start_time, "новостей", errors, skipped)
+    return ScrapeOutput(data, log, fingerprints, skipped, len(errors))
+
+
+# ================== СТУДИИ ==================
+
+async def fetch_studios(known: set[str] = frozenset()) -> ScrapeOutput:
+    start_time = time.time()
+    data, fingerprints, skipped, errors = {}, {}, set(), []
+
+    async with _session() as http:
+        fetcher = _Fetcher(http)
+        page = await fetcher.page(STUDIOS_URL)
+        tabs_content = find(page, "tabs-content")
+        items = find_all(find(find(tabs_content, "tab-item.tab-all"), "flex"), "services__item")
+
+        cards = []
+        for item in items:
+            try:
+                img = attr(find(item, "services__item-image"), "img", "src", STUDIOS_URL)
+                is_paid = element_text(item.xpath(".//div")[-1]).lower() == 'платно'
+                link = _info_link(find(item, "services__item-info"), STUDIOS_URL) or _info_link(item, STUDIOS_URL)
+                if link is None:
+                    raise LookupError("нет ссылки на описание")
+            except Exception as e:
+                errors.append(f"студия: картинка/имя/платно: {e}")
+                continue
+            fingerprint = _card_fingerprint(item, link, STUDIOS_URL)
+            if fingerprint in known:
+                skipped.add(fingerprint)
+                continue
+            cards.append((link, img, is_paid, fingerprint))
+
+        modals = await fetcher.modals([card[0] for card in cards])
+
+    for (link, img, is_paid, fingerprint), modal in zip(cards, modals):
+        try:
+            if isinstance(modal, Exception):
+                raise modal
+            info = _modal(modal)
+            title = element_text(find(info, "title"))
+            description = element_text(find(info, "modal_more_text"))
+            more_info = [element_text(el) for el in find_all(info, "modal_more_info_text")]
+            teacher = more_info[0]
+            age = more_info[-1]
+            cost_text = more_info[-2] if is_paid and len(more_info) > 1 else 0
+            try:
+                qr_img = urljoin(link, find(info, "about__slider").xpath(".//a[@href]")[0].get("href"))
+            except (LookupError, IndexError):
+                qr_img = None
+                errors.append(f"{title}: нет QR-кода")
+
+            cost, second_cost = split_cost(cost_text)
+            data[title] = [description, cost, second_cost, age, img, qr_img, teacher, 'unknown']
+            fingerprints[title] = fingerprint
+        except Exception as e:
+            errors.append(f"{link}: {e}")
+
+    # категории: вкладки после «Все» идут в том же порядке, что и блоки tab-item;
+    # собираются для всех карточек, включая пропущенные без изменений
+    categories: dict[str, str] = {}
+    try:
+        tabs = find_all(find(page, "tabs-wrapper"), "tabs")[0].xpath(".//span")
+        tab_items = [el for el in find_all(tabs_content, "tab-item") if "tab-all" not in el.get("class", "")]
+        if len(tabs) - 1 != len(tab_items):
+            raise LookupError(f"вкладок {len(tabs) - 1}, блоков {len(tab_items)}")
+        for tab, tab_item in zip(tabs[1:], tab_items):
+            category = element_text(tab).lower()
+            items = find_all(tab_item, "services__item")
+            if not items:
+                # блок вкладки сайт заполняет скриптом — без браузера категорий не узнать
+                raise LookupError(f"вкладка «{category}» пустая в HTML")
+            for item in items:
+                divs = item.xpath(".//div")
+                name = element_text(divs[1]) if len(divs) > 1 else ""
+                if name:
+                    categories[name] = categories.get(name, "") + category
+    except Exception as e:
+        errors.append(f"категории: {e}")
+        categories = {}
+    for name, values in data.items():
+        values[-1] = categories.get(name, "unknown")
+
+    text = f"Обновление завершено за {round(time.time() - start_time)} сек"
+    text += skipped_line(skipped)
+    if errors:
+        text += f'\nБыло обновлено {len(data)} студий\nБыло {len(errors)} ошибок при выполнении\n'
+        logger.warning("Ошибки HTTP-парсера студий:\n%s", "\n".join(errors))
+    return ScrapeOutput(data, text, fingerprints, skipped, len(errors), categories)
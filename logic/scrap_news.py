@@ -1,34 +1,34 @@
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 import time
-import undetected_chromedriver as uc
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 
-def update_all_news():
-    url = "https://дк-яуза.рф/novosti/"
+from logic.browser_pool import browser_pool
+from logic.scrap_common import NEWS_URL, ScrapeOutput, selenium_card_fingerprint, skipped_line
+from logic.single_flight import report_progress
+from logic.waits import Waiter, MODAL, page_loaded, items_settled, text_changed, nothing_visible, current_text
 
-    start_time = time.time()
+def update_all_news(driver=None, known: set[str] = frozenset()) -> ScrapeOutput:
+    """known — отпечатки карточек, которые уже есть в БД: их окна не открываются."""
+    if driver is None:
+        with browser_pool.tab() as driver:
+            return update_all_news(driver, known)
 
-    options = uc.ChromeOptions()
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--disable-software-rasterizer")
-    options.add_argument("--headless=new")
+    url = NEWS_URL
 
-    # driver = uc.Chrome(options=options, version_main=139)
-    driver = uc.Chrome(options=options)
+    start_time = time.time()
+    waiter = Waiter(driver)
 
     driver.get(url)
-    time.sleep(4)
+    waiter.until("загрузка страницы", page_loaded)
 
     driver.execute_script("window.scrollTo(0, document.body.scrollHeight)")
-    time.sleep(4)
+    waiter.until("подгрузка карточек", items_settled((By.CSS_SELECTOR, '.news .news_block')), required=False)
 
     text = ''
-    data = {}
+    data, fingerprints, skipped = {}, {}, set()
     counter = 0
     error_counter = 0
     try:
@@ -37,18 +37,29 @@ def update_all_news():
         news_list = news_table.find_elements(By.CLASS_NAME,'b-event__slide-item.news_block')
     except:
         text = 'Ошибка с нахождением блоков новостей'
-        driver.quit()
-        return data, text
+        return ScrapeOutput(data, text, errors=1)
     for item in news_list[-1::-1]:
+        report_progress(counter, len(news_list))
         driver.execute_script("arguments[0].scrollIntoView(true);", item)
         counter += 1
+        # заголовок прошлой карточки читается, пока окно ещё открыто
+        previous = current_text(driver, MODAL)
         body.send_keys(Keys.ESCAPE)
-        time.sleep(0.5)
+        waiter.until("закрытие окна", nothing_visible(MODAL), timeout=2, required=False)
+
+        try:
+            card_link = item.find_element(By.CLASS_NAME,'b-event__slide-link.js-load-info')
+            fingerprint = selenium_card_fingerprint(item, card_link.get_attribute('href'))
+        except:
+            error_counter += 1
+            continue
+        if fingerprint in known:
+            skipped.add(fingerprint)
+            continue
 
-        item.find_element(By.CLASS_NAME,'b-event__slide-link.js-load-info').click()
-        time.sleep(2)
         try:
-            info_table = driver.find_element(By.ID,'hidden-content-2')
+            card_link.click()
+            info_table = waiter.until("открытие окна", text_changed(MODAL, previous))
         except:
             # text += f'Ошибка с поиском блока информации {counter} новости'
             error_counter +=1
@@ -73,12 +84,13 @@ def update_all_news():
             error_counter += 1
             continue
         data[title] = [description, img]
+        fingerprints[title] = fingerprint
     end_time = time.time()
     elapsed_time = end_time - start_time
     text = f"Обновление завершено за {round(elapsed_time)} сек."
+    text += skipped_line(skipped)
     if error_counter > 0:
         text += f"При обновлении было пропущено {error_counter} новостей"
-    driver.close()
-    driver.quit()
-    return data, text
+    text += f"\n{waiter.report()}"
+    return ScrapeOutput(data, text, fingerprints, skipped, error_counter)
 #        data[title] = [img, description]
\ No newline at end of file
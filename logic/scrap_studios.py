@@ -3,73 +3,73 @@ import logging
 import time
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-import undetected_chromedriver as uc
-import re
 
+from logic.browser_pool import browser_pool
+from logic.scrap_common import STUDIOS_URL, ScrapeOutput, split_cost, selenium_card_fingerprint, skipped_line
+from logic.single_flight import report_progress
+from logic.waits import Waiter, page_loaded, items_settled, text_changed, visible_with_children, nothing_visible, current_text
 
-logger = logging.getLogger(__name__)
 
+logger = logging.getLogger(__name__)
 
-def extract_numbers(text: str) -> list[int]:
-    """
-    Извлекает все целые числа из строки.
-    Возвращает список int.
-    """
-    # \d+ — одна или несколько цифр
-    numbers = re.findall(r'\d+', str(text))
-    # конвертируем в int
-    return [int(num) for num in numbers] if numbers else []
 
+def update_all_studios(driver=None, known: set[str] = frozenset()) -> ScrapeOutput:
+    """known — отпечатки карточек, которые уже есть в БД: их окна не открываются."""
+    if driver is None:
+        with browser_pool.tab() as driver:
+            return update_all_studios(driver, known)
 
-def update_all_studios():
-    url = "https://дк-яуза.рф/studii/"
+    url = STUDIOS_URL
 
     start_time = time.time()
-
-    options = uc.ChromeOptions()
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--disable-software-rasterizer")
-    options.add_argument("--headless=new")
-
-    # driver = uc.Chrome(options=options, version_main=139)
-    driver = uc.Chrome(options=options)
+    waiter = Waiter(driver)
+    modal_text = (By.CLASS_NAME, 'modal_more_text')
 
     driver.get(url)
-    time.sleep(2)
+    waiter.until("загрузка страницы", page_loaded)
 
     driver.execute_script("window.scrollTo(0, document.body.scrollHeight)")
-    time.sleep(2)
+    waiter.until("подгрузка карточек", items_settled((By.CSS_SELECTOR, '.tab-all .services__item')), required=False)
 
     error_text = ''
 
     elements_parent = driver.find_element(By.CLASS_NAME,'tabs-content').find_element(By.CLASS_NAME,'tab-item.tab-all').find_element(By.CLASS_NAME,'flex')
     items = elements_parent.find_elements(By.CLASS_NAME,f'services__item')
-    data = {}
+    data, fingerprints, skipped = {}, {}, set()
     counter = 0
     error_counter = 0
-    driver.execute_script("arguments[0].scrollIntoView(true);", items[0])
-    time.sleep(3)
     for item in items:
+        report_progress(counter, len(items))
         counter+=1
         driver.execute_script("arguments[0].scrollIntoView(true);", item)
         body = driver.find_element(By.TAG_NAME,'body')
+        # заголовок прошлой карточки читается, пока окно ещё открыто
+        previous = current_text(driver, modal_text)
         body.send_keys(Keys.ESCAPE)
-        time.sleep(1)
+        waiter.until("закрытие окна", nothing_visible(modal_text), timeout=2, required=False)
 
         try:  #----------GET img link / is_free and  clicking for details
             img = item.find_element(By.CLASS_NAME,'services__item-image').find_element(By.TAG_NAME,'img').get_attribute('src')
             is_free = item.find_elements(By.TAG_NAME,'div')[-1].text
             is_free = is_free.lower() == 'платно'
 
-            item.find_element(By.CLASS_NAME,'services__item-info').click()
+            info = item.find_element(By.CLASS_NAME,'services__item-info')
+            fingerprint = selenium_card_fingerprint(item, info.get_attribute('href') or info.get_attribute('data-href'))
+            if fingerprint in known:
+                skipped.add(fingerprint)
+                continue
+            info.click()
 
         except Exception as e:
             error_counter +=1
             logger.warning(f"ошибка на {counter} студии: картинка/имя/платно: \n{e}")
             continue
-        time.sleep(2)
+        try:
+            waiter.until("открытие окна", text_changed(modal_text, previous))
+        except Exception as e:
+            error_counter +=1
+            logger.warning(f"ошибка на {counter} студии: окно не открылось \n{e}")
+            continue
 
         try: # -------- GET name
             title = driver.find_element(By.CLASS_NAME,'title').text
@@ -114,47 +114,50 @@ def update_all_studios():
 
         category = 'unknown'
 
-        time.sleep(0.5)
-        temp_list = extract_numbers(str(cost))
-        if len(temp_list) > 1:
-            second_cost = temp_list[1]
-        else:
-            second_cost = None
-        cost = temp_list[0]
+        cost, second_cost = split_cost(cost)
         try:
             studio_info = [description,cost,second_cost, age,img,qr_img,teacher, category]
             data[title] = studio_info
+            fingerprints[title] = fingerprint
         except:
             error_counter +=1
     categories = driver.find_element(By.CLASS_NAME,'tabs-wrapper').find_elements(By.CLASS_NAME,'tabs')[0].find_elements(By.TAG_NAME,'span')
 
 
     body.send_keys(Keys.ESCAPE)
-    time.sleep(2)
+    waiter.until("закрытие окна", nothing_visible(modal_text), timeout=2, required=False)
+    loaded_tab = (By.CSS_SELECTOR, '.tab-item.done')
+    studio_item = (By.CLASS_NAME, 'services__item')
+    # категории всех карточек, включая пропущенные без изменений
+    studio_categories: dict[str, str] = {}
+    tabs_failed = False
     try:
+        previous_tab = None
         for category in categories[1:]:
             try:
-                time.sleep(2)
                 category.click()
-                items = driver.find_element(By.CLASS_NAME,'tab-item.done').find_element(By.CLASS_NAME,'flex').find_elements(By.CLASS_NAME,'services__item')
+                previous_tab = waiter.until("загрузка категории", visible_with_children(loaded_tab, studio_item, exclude=previous_tab))
+                items = previous_tab.find_element(By.CLASS_NAME,'flex').find_elements(By.CLASS_NAME,'services__item')
                 for i in items:
                     studios = i.find_elements(By.TAG_NAME,'div')[1].text
-                    if data[studios][-1] == "unknown":
-                        data[studios][-1] = category.text.lower()
-                    else:
-                        data[studios][-1] += category.text.lower()
+                    if studios:
+                        studio_categories[studios] = studio_categories.get(studios, "") + category.text.lower()
             except Exception as e:
                 logger.warning(f"ошибка на категории {category} : \n{e}")
 
                 error_counter +=1
+                tabs_failed = True
     except:
-        pass
+        tabs_failed = True
+    for studios, studio_info in data.items():
+        studio_info[-1] = studio_categories.get(studios, "unknown")
     end_time = time.time()
     elapsed_time = end_time - start_time
     text = f"Обновление завершено за {round(elapsed_time)} сек"
+    text += skipped_line(skipped)
     if error_counter > 0:
         text += f'\nБыло обновлено {len(data)} студий\nБыло {error_counter} ошибок при выполнении\n'
-    driver.close()
-    driver.quit()
+    text += f"\n{waiter.report()}"
 
-    return data, text
+    return ScrapeOutput(data, text, fingerprints, skipped, error_counter,
+                        {} if tabs_failed else studio_categories)
@@ -0,0 +1,85 @@
+"""
+Не больше одного обновления раздела одновременно.
+
+Плановое обновление и кнопки «Обновить все …» в админке запускают одно
+и то же. Если раздел уже обновляется, повторный вызов не запускает второй
+браузер, а дожидается идущего прогона и получает его результат.
+Парсеры сообщают о ходе работы через `report_progress`, поэтому
+администратору можно показать, сколько уже сделано.
+"""
+
+import asyncio
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+
+# ================== ЛОГИРОВАНИЕ ==================
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Flight:
+    """Идущий прогон: задача и её прогресс."""
+    key: str
+    started: float = field(default_factory=time.monotonic)
+    task: asyncio.Task | None = None
+    done: int = 0
+    total: int = 0
+
+    @property
+    def percent(self) -> int:
+        return int(self.done * 100 / self.total) if self.total else 0
+
+    @property
+    def elapsed(self) -> int:
+        return round(time.monotonic() - self.started)
+
+
+# прогон, внутри которого выполняется код (копируется в asyncio.to_thread)
+_current: ContextVar[Flight | None] = ContextVar("current_flight", default=None)
+
+
+def report_progress(done: int, total: int) -> None:
+    """Обработано `done` карточек из `total`. Вне прогона ничего не делает."""
+    flight = _current.get()
+    if flight is not None:
+        flight.done, flight.total = done, total
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self._flights: dict[str, Flight] = {}
+
+    def running(self, key: str) -> Flight | None:
+        return self._flights.get(key)
+
+    async def run(self, key: str, factory: Callable[[], Awaitable[Any]]) -> tuple[Any, bool]:
+        """
+        Выполнить `factory()` под ключом `key` или присоединиться к уже идущему.
+        Возвращает (результат, присоединились ли к чужому прогону).
+        Отмена одного из ожидающих не прерывает прогон для остальных.
+        """
+        flight = self._flights.get(key)
+        if flight is not None:
+            logger.info(f"«{key}» уже выполняется ({flight.percent}%), ждём результат")
+            return await asyncio.shield(flight.task), True
+
+        flight = Flight(key)
+
+        async def lead():
+            _current.set(flight)
+            try:
+                return await factory()
+            finally:
+                self._flights.pop(key, None)
+
+        flight.task = asyncio.create_task(lead())
+        self._flights[key] = flight
+        return await asyncio.shield(flight.task), False
+
+
+scrape_flights = SingleFlight()
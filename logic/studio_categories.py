@@ -0,0 +1,66 @@
+"""
+Меню категорий студий в памяти процесса.
+
+Категории и их коды хранятся в таблице studio_categories, которую ведут
+синхронизация студий и правки в админке. Таблица читается один раз
+(на старте или при первом открытии меню); после изменения студий кэш
+сбрасывается через `invalidate` и перечитывается при следующем обращении.
+Коды не зависят от перезапуска, поэтому старые кнопки `std_list_*`
+продолжают открывать свою категорию.
+"""
+
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.orm_query import orm_get_studio_categories
+
+
+# ================== ЛОГИРОВАНИЕ ==================
+
+logger = logging.getLogger(__name__)
+
+
+class StudioCategoryCache:
+    def __init__(self) -> None:
+        self._rows: list | None = None
+        self._by_code: dict[str, str] = {}
+        # растёт при каждом invalidate; _loaded_generation — поколение, на котором
+        # началось чтение _rows. Чтение, начатое до сброса, повторится при следующем ensure
+        self._generation = 0
+        self._loaded_generation = -1
+
+    @property
+    def loaded(self) -> bool:
+        return self._rows is not None and self._loaded_generation == self._generation
+
+    async def load(self, session: AsyncSession) -> None:
+        generation = self._generation
+        rows = list(await orm_get_studio_categories(session))
+        self._rows = rows
+        self._by_code = {row.code: row.name for row in rows}
+        self._loaded_generation = generation
+        logger.debug(f"Загружено категорий студий: {len(rows)}")
+
+    async def ensure(self, session: AsyncSession) -> None:
+        if not self.loaded:
+            await self.load(session)
+
+    def invalidate(self) -> None:
+        """Студии изменились — перечитать таблицу при следующем обращении."""
+        self._generation += 1
+
+    def name(self, code: str) -> str | None:
+        """Категория по коду из callback_data; кэш должен быть загружен."""
+        return self._by_code.get(code)
+
+    def menu(self, is_free: bool) -> list[tuple[str, str]]:
+        """(код, категория) для категорий, где есть бесплатные / платные студии."""
+        return [
+            (row.code, row.name)
+            for row in self._rows or ()
+            if (row.free_count if is_free else row.paid_count)
+        ]
+
+
+studio_categories = StudioCategoryCache()
@@ -0,0 +1,253 @@
+"""
+Синхронизация разделов сайта с БД.
+
+Одна реализация «спарсить → сверить с БД → оповестить» для афиши,
+новостей и студий. Её вызывают и плановое обновление (`scrap_everything`),
+и кнопки «Обновить все …» в админке, поэтому у них одинаковые пакетная
+запись, учёт `lock_changes` и тексты рассылок. Оба пути идут через
+`sync_section`: одновременно раздел обновляется только один раз.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Awaitable, Callable
+
+from aiogram import Bot
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.engine import Session
+from database.models import Events, News, Studios
+from database.orm_query import orm_get_fingerprints, orm_sync_events, orm_sync_news, orm_sync_studios
+from handlers.notification import notify_subscribers
+from logic.scrap_common import ScrapeOutput
+from logic.scrap_fetch import fetch_events, fetch_news, fetch_studios
+from logic.event_listing import event_listing
+from logic.single_flight import scrape_flights
+from logic.studio_categories import studio_categories
+
+
+# ================== ЛОГИРОВАНИЕ ==================
+
+logger = logging.getLogger(__name__)
+
+Fetcher = Callable[[set[str]], Awaitable[ScrapeOutput]]
+
+SECTION_TITLES = {
+    "events": "🎭 События",
+    "news": "📰 Новости",
+    "studios": "🎨 Студии",
+}
+
+
+@dataclass
+class SyncResult:
+    """Итог синхронизации раздела."""
+    section: str                      # "events" | "news" | "studios"
+    ok: bool = True
+    error: str = ""
+    added: int = 0
+    updated: int = 0
+    removed: int = 0
+    skipped: int = 0                  # карточки без изменений (не открывались)
+    invalid: list[str] = field(default_factory=list)  # записи с неверным форматом
+    notified: int = 0
+    log: str = ""
+
+    def summary(self) -> str:
+        """Одна строка для сводного отчёта."""
+        title = SECTION_TITLES[self.section]
+        if not self.ok:
+            return f"❌ {title}: {self.error}"
+        text = f"{title}: обновлено {self.updated}, добавлено {self.added}"
+        if self.section == "studios":
+            text += f", удалено {self.removed}"
+        return text + f", без изменений {self.skipped}"
+
+    def report(self) -> str:
+        """Подробный отчёт для администратора."""
+        if not self.ok:
+            return f"❌ Ошибка парсера: {self.error}"
+        lines = [
+            self.log,
+            "",
+            f"🔄 Обновлено: {self.updated}",
+            f"➕ Добавлено: {self.added}",
+        ]
+        if self.section == "studios":
+            lines.append(f"🗑 Удалено: {self.removed}")
+        lines.append(f"⏭ Без изменений: {self.skipped}")
+        if self.invalid:
+            lines.append(f"⚠ Неверный формат: {', '.join(self.invalid)}")
+        return "\n".join(lines)
+
+
+async def _scrape(session: AsyncSession, result: SyncResult, model, fetcher: Fetcher) -> ScrapeOutput | None:
+    try:
+        output = await fetcher(await orm_get_fingerprints(session, model))
+    except Exception as e:
+        logger.exception(f"Ошибка парсера ({result.section}): {e}")
+        result.ok, result.error = False, str(e)
+        return None
+    result.log, result.skipped = output.log, len(output.skipped)
+    return output
+
+
+# ================== АФИША ==================
+
+async def sync_events(
+    session: AsyncSession,
+    bot: Bot | None = None,
+    notify: bool = False,
+    fetcher: Fetcher = fetch_events,
+) -> SyncResult:
+    result = SyncResult("events")
+    output = await _scrape(session, result, Events, fetcher)
+    if output is None:
+        return result
+
+    items = {}
+    for name, values in output.data.items():
+        try:
+            event_date, description, age_limits, img, link, is_free = values
+            items[name] = {
+                "date": datetime.strptime(event_date, "%Y-%m-%d %H:%M"),
+                "description": description,
+                "age_limits": age_limits,
+                "img": img,
+                "link": link,
+                "is_free": is_free,
+                "fingerprint": output.fingerprints.get(name),
+            }
+        except ValueError:
+            logger.warning("⚠ Ошибка формата события: %s", name)
+            result.invalid.append(name)
+
+    added_names, result.updated = await orm_sync_events(session, items)
+    event_listing.invalidate()
+    result.added = len(added_names)
+
+    if notify and bot:
+        for name in added_names:
+            event_date, _, age_limits, img, _, _ = output.data[name]
+            text = f"📰 Обновление в афише!\n\n{name.capitalize()} | +{age_limits}\n{event_date}"
+            await notify_subscribers(bot, session, text, img, type_="events")
+            result.notified += 1
+
+    logger.info(f"Синхронизация афиши: {result.summary()}")
+    return result
+
+
+# ================== НОВОСТИ ==================
+
+async def sync_news(
+    session: AsyncSession,
+    bot: Bot | None = None,
+    notify: bool = False,
+    fetcher: Fetcher = fetch_news,
+) -> SyncResult:
+    result = SyncResult("news")
+    output = await _scrape(session, result, News, fetcher)
+    if output is None:
+        return result
+
+    items = {}
+    for name, values in output.data.items():
+        try:
+            description, img = values
+            items[name] = {"description": description, "img": img, "fingerprint": output.fingerprints.get(name)}
+        except ValueError:
+            logger.warning("⚠ Ошибка формата новости: %s", name)
+            result.invalid.append(name)
+
+    added_names, result.updated = await orm_sync_news(session, items)
+    result.added = len(added_names)
+
+    if notify and bot:
+        for name in added_names:
+            _, img = output.data[name]
+            await notify_subscribers(bot, session, f"📰 Обновление в новостях!\n\n{name.capitalize()}", img, type_="news")
+            result.notified += 1
+
+    logger.info(f"Синхронизация новостей: {result.summary()}")
+    return result
+
+
+# ================== СТУДИИ ==================
+
+def studio_values(values: list, fingerprint: str | None) -> dict:
+    """Список полей студии из парсера → значения столбцов Studios."""
+    description, cost, second_cost, age, img, qr_img, teacher, category = values
+    return {
+        "description": description,
+        "teacher": teacher,
+        "cost": int(cost),
+        # second_cost хранится текстом
+        "second_cost": str(second_cost) if second_cost is not None else None,
+        "age": age,
+        "category": category,
+        "qr_img": qr_img,
+        "img": img,
+        "fingerprint": fingerprint,
+    }
+
+
+async def sync_studios(
+    session: AsyncSession,
+    bot: Bot | None = None,
+    notify: bool = False,
+    fetcher: Fetcher = fetch_studios,
+) -> SyncResult:
+    """Студии не рассылаются; bot и notify оставлены для единой сигнатуры."""
+    result = SyncResult("studios")
+    output = await _scrape(session, result, Studios, fetcher)
+    if output is None:
+        return result
+
+    items = {}
+    for name, values in output.data.items():
+        try:
+            items[name] = studio_values(values, output.fingerprints.get(name))
+        except ValueError:
+            logger.warning("⚠ Ошибка формата студии: %s", name)
+            result.invalid.append(name)
+
+    # удалять пропавшие студии можно, только если сайт прочитан полностью
+    remove_missing = bool(items or output.skipped) and output.errors == 0 and not result.invalid
+    result.added, result.updated, result.removed = await orm_sync_studios(
+        session, items, output.skipped, remove_missing, output.categories
+    )
+    studio_categories.invalidate()
+
+    logger.info(f"Синхронизация студий: {result.summary()}")
+    return result
+
+
+# ================== ЗАПУСК ==================
+
+SYNCS = {
+    "events": sync_events,
+    "news": sync_news,
+    "studios": sync_studios,
+}
+
+
+async def sync_section(
+    section: str,
+    bot: Bot | None = None,
+    notify: bool = False,
+    fetcher: Fetcher | None = None,
+) -> tuple[SyncResult, bool]:
+    """
+    Синхронизировать раздел в собственной сессии.
+    Если раздел уже обновляется, дождаться идущего прогона и вернуть его
+    результат (оповещения тогда рассылаются по настройкам первого вызова).
+    Возвращает (результат, присоединились ли к идущему прогону).
+    """
+    async def run() -> SyncResult:
+        async with Session() as session:
+            if fetcher is None:
+                return await SYNCS[section](session, bot, notify)
+            return await SYNCS[section](session, bot, notify, fetcher=fetcher)
+
+    return await scrape_flights.run(section, run)
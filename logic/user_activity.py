@@ -0,0 +1,122 @@
+"""
+Пользователи в памяти процесса: кэш строк `Users` и буфер «последнего визита».
+
+Раньше `DataBaseSession` на каждое сообщение и нажатие кнопки читал
+пользователя и коммитил `updated = now()`. Теперь строка берётся из
+LRU-кэша (при промахе — один SELECT по первичному ключу), а время визита
+копится в памяти и раз в несколько секунд записывается одним UPDATE
+на всю пачку. Запись в БД при обычном нажатии не происходит вовсе.
+"""
+
+import asyncio
+import logging
+import os
+from collections import OrderedDict
+from datetime import datetime
+
+from sqlalchemy import update, bindparam
+
+from database.engine import Session
+from database.models import Users
+
+
+# ================== ЛОГИРОВАНИЕ ==================
+
+logger = logging.getLogger(__name__)
+
+# ================== НАСТРОЙКИ ==================
+
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))            # пользователей в кэше
+LAST_SEEN_FLUSH_INTERVAL = float(os.getenv("LAST_SEEN_FLUSH_INTERVAL", "5"))  # секунд между записями в БД
+
+
+class UserCache:
+    """LRU-кэш отсоединённых от сессии строк Users."""
+
+    def __init__(self, max_size: int = USER_CACHE_SIZE) -> None:
+        self.max_size = max_size
+        self._users: OrderedDict[int, Users] = OrderedDict()
+
+    def get(self, user_id: int) -> Users | None:
+        user = self._users.get(user_id)
+        if user is not None:
+            self._users.move_to_end(user_id)
+        return user
+
+    def put(self, user: Users) -> None:
+        self._users[user.user_id] = user
+        self._users.move_to_end(user.user_id)
+        while len(self._users) > self.max_size:
+            self._users.popitem(last=False)
+
+    def invalidate(self, *user_ids: int) -> None:
+        """Забыть пользователей: строка в БД изменилась (подписки, отключение)."""
+        for user_id in user_ids:
+            self._users.pop(user_id, None)
+
+
+class LastSeenBuffer:
+    """Время последнего визита в памяти; фоновая задача сбрасывает его в БД пачками."""
+
+    def __init__(self, interval: float = LAST_SEEN_FLUSH_INTERVAL) -> None:
+        self.interval = interval
+        self._seen: dict[int, datetime] = {}
+        self._task: asyncio.Task | None = None
+
+    def touch(self, user_id: int) -> None:
+        self._seen[user_id] = datetime.now()
+
+    async def flush(self) -> int:
+        """Записать накопленное одним UPDATE; вернуть число пользователей."""
+        if not self._seen:
+            return 0
+        seen, self._seen = self._seen, {}
+        rows = [{"uid": user_id, "seen": moment} for user_id, moment in seen.items()]
+        # пользователь снова пишет боту — возвращаем его в рассылки
+        stmt = (
+            update(Users.__table__)
+            .where(Users.__table__.c.user_id == bindparam("uid"))
+            .values(updated=bindparam("seen"), is_active=True)
+        )
+        try:
+            async with Session() as session:
+                await session.execute(stmt, rows)
+                await session.commit()
+        except Exception:
+            # вернуть в буфер то, что не перезаписано новыми визитами
+            for user_id, moment in seen.items():
+                self._seen.setdefault(user_id, moment)
+            raise
+        return len(rows)
+
+    def start(self) -> None:
+        if self._task and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"Не удалось записать время визитов при остановке: {e}", exc_info=True)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                count = await self.flush()
+                if count:
+                    logger.debug(f"Записано время визита {count} пользователей")
+            except Exception as e:
+                logger.error(f"Ошибка записи времени визитов: {e}", exc_info=True)
+
+
+user_cache = UserCache()
+last_seen = LastSeenBuffer()
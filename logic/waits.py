@@ -0,0 +1,186 @@
+"""
+Ожидания в Selenium-парсерах по условиям вместо фиксированных пауз.
+
+`Waiter` опрашивает DOM через `WebDriverWait`, пока не выполнится
+условие (страница загрузилась, модальное окно открылось с новым
+заголовком, вкладка категории подгрузилась), и запоминает, сколько
+длился каждый шаг. Сводка по шагам добавляется к отчёту парсера.
+"""
+
+import logging
+import os
+import time
+from collections import defaultdict
+from typing import Any, Callable
+
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+
+# ================== ЛОГИРОВАНИЕ ==================
+
+logger = logging.getLogger(__name__)
+
+# ================== НАСТРОЙКИ ==================
+
+WAIT_TIMEOUT = float(os.getenv("SCRAPER_WAIT_TIMEOUT", "10"))  # секунд на один шаг
+POLL_INTERVAL = 0.1
+
+Locator = tuple[str, str]
+
+MODAL = (By.ID, "hidden-content-2")            # окно с подробностями карточки (общее, содержимое подменяет AJAX)
+MODAL_TITLE = (By.CLASS_NAME, "title")         # заголовок карточки в этом окне
+
+
+# ================== УСЛОВИЯ ==================
+
+def page_loaded(driver) -> bool:
+    return driver.execute_script("return document.readyState") == "complete"
+
+
+class items_settled:
+    """
+    Количество элементов перестало расти: после прокрутки вниз
+    сайт догружает карточки, ждём, пока список не замрёт на `quiet` секунд.
+    """
+
+    def __init__(self, locator: Locator, quiet: float = 0.7) -> None:
+        self.locator = locator
+        self.quiet = quiet
+        self._count = -1
+        self._changed = 0.0
+
+    def __call__(self, driver):
+        items = driver.find_elements(*self.locator)
+        now = time.monotonic()
+        if len(items) != self._count:
+            self._count, self._changed = len(items), now
+            return False
+        return items if items and now - self._changed >= self.quiet else False
+
+
+def _title_text(driver, element, title: Locator) -> str:
+    """
+    textContent заголовка `title` внутри `element`; если внутри его нет —
+    первого `title` на странице (так заголовок читает парсер студий).
+    textContent, в отличие от .text, доступен и у скрытого окна.
+    """
+    found = element.find_elements(*title) or driver.find_elements(*title)
+    return " ".join((found[0].get_attribute("textContent") or "").split()) if found else ""
+
+
+class text_changed:
+    """
+    Видимый элемент `locator`, заголовок `title` в котором непустой и отличается
+    от `previous` — окно показывает уже новую карточку, а не прошлую до подмены AJAX.
+    """
+
+    def __init__(self, locator: Locator, previous: str, title: Locator = MODAL_TITLE) -> None:
+        self.locator = locator
+        self.previous = previous
+        self.title = title
+
+    def __call__(self, driver):
+        for element in driver.find_elements(*self.locator):
+            try:
+                if not element.is_displayed():
+                    continue
+                text = _title_text(driver, element, self.title)
+                if text and text != self.previous:
+                    return element
+            except StaleElementReferenceException:
+                return False
+        return False
+
+
+class visible_with_children:
+    """
+    Видимый элемент `locator`, внутри которого уже есть `child` (подгруженная вкладка).
+    `exclude` — элемент, который был виден до действия и не подходит.
+    """
+
+    def __init__(self, locator: Locator, child: Locator, exclude=None) -> None:
+        self.locator = locator
+        self.child = child
+        self.exclude = exclude
+
+    def __call__(self, driver):
+        for element in driver.find_elements(*self.locator):
+            try:
+                if element == self.exclude:
+                    continue
+                if element.is_displayed() and element.find_elements(*self.child):
+                    return element
+            except StaleElementReferenceException:
+                return False
+        return False
+
+
+def nothing_visible(locator: Locator) -> Callable:
+    """Ни одного видимого элемента `locator` (модальное окно закрыто)."""
+    def condition(driver) -> bool:
+        try:
+            return not any(el.is_displayed() for el in driver.find_elements(*locator))
+        except StaleElementReferenceException:
+            return False
+    return condition
+
+
+def displayed(element) -> Callable:
+    def condition(driver) -> bool:
+        try:
+            return element.is_displayed()
+        except StaleElementReferenceException:
+            return True
+    return condition
+
+
+def current_text(driver, locator: Locator, title: Locator = MODAL_TITLE) -> str:
+    """Заголовок окна `locator` до действия (пока оно открыто) — для `text_changed`."""
+    try:
+        return _title_text(driver, driver.find_element(*locator), title)
+    except Exception:
+        return ""
+
+
+# ================== ОЖИДАНИЕ ==================
+
+class Waiter:
+    """Ожидания одного прогона парсера со статистикой по шагам."""
+
+    def __init__(self, driver, timeout: float = WAIT_TIMEOUT) -> None:
+        self.driver = driver
+        self.timeout = timeout
+        self._durations: dict[str, list[float]] = defaultdict(list)
+        self._timeouts: dict[str, int] = defaultdict(int)
+
+    def until(self, step: str, condition: Callable, timeout: float | None = None, required: bool = True) -> Any:
+        """
+        Ждать, пока `condition(driver)` не вернёт истинное значение, и вернуть его.
+        По таймауту: при required=True — TimeoutException, иначе None.
+        """
+        started = time.monotonic()
+        try:
+            return WebDriverWait(self.driver, timeout or self.timeout, POLL_INTERVAL).until(condition)
+        except TimeoutException:
+            self._timeouts[step] += 1
+            if required:
+                raise TimeoutException(f"не дождались шага «{step}»")
+            return None
+        finally:
+            self._durations[step].append(time.monotonic() - started)
+
+    def report(self) -> str:
+        lines = ["⏱ Ожидания по шагам:"]
+        for step, durations in self._durations.items():
+            line = (
+                f"• {step}: {len(durations)} × {sum(durations) / len(durations):.2f} сек "
+                f"(всего {sum(durations):.1f}, макс {max(durations):.2f})"
+            )
+            if self._timeouts[step]:
+                line += f", таймаутов {self._timeouts[step]}"
+            lines.append(line)
+        text = "\n".join(lines)
+        logger.info(text)
+        return text
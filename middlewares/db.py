@@ -1,15 +1,40 @@
-import datetime
 from typing import Any, Awaitable, Callable, Dict, Optional
 
-import sqlalchemy
 from aiogram import BaseMiddleware
 from aiogram.types import TelegramObject, Message, CallbackQuery, User
-from sqlalchemy import DATETIME
 
-from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.future import select
 
 from database.models import Users
+from logic.user_activity import user_cache, last_seen
+
+
+class LazySession:
+    """
+    AsyncSession, которая создаётся при первом обращении к ней.
+    Хендлеры статичных экранов (помощь, контакты, услуги) сессию не трогают —
+    для них она не создаётся и соединение из пула не берётся.
+    """
+
+    __slots__ = ("_factory", "_session")
+
+    def __init__(self, factory: async_sessionmaker) -> None:
+        self._factory = factory
+        self._session: Optional[AsyncSession] = None
+
+    @property
+    def started(self) -> bool:
+        return self._session is not None
+
+    def __getattr__(self, name: str) -> Any:
+        if self._session is None:
+            self._session = self._factory()
+        return getattr(self._session, name)
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
 
 
 class DataBaseSession(BaseMiddleware):
@@ -22,7 +47,8 @@ class DataBaseSession(BaseMiddleware):
         event: TelegramObject,
         data: Dict[str, Any],
     ) -> Any:
-        async with self.session_pool() as session:
+        session = LazySession(self.session_pool)
+        try:
             data["session"] = session
 
             tg_user: Optional[User] = None
@@ -33,23 +59,29 @@ class DataBaseSession(BaseMiddleware):
 
             user: Optional[Users] = None
             if tg_user is not None:
-                result = await session.execute(select(Users).where(Users.user_id == tg_user.id))
-                user = result.scalar_one_or_none()
-
+                user = user_cache.get(tg_user.id)
                 if user is None:
-                    # Создаём пользователя с дефолтными настройками
-                    user = Users(
-                        user_id=tg_user.id,
-                        username=tg_user.username,
-                        first_name=tg_user.first_name,
-                        last_name=tg_user.last_name,
-                        news_subscribed=False,
-                        events_subscribed=False,
-                    )
-                    session.add(user)
-                    await session.commit()
-                else:
-                    user.updated = sqlalchemy.func.now()
-                    await session.commit()
+                    result = await session.execute(select(Users).where(Users.user_id == tg_user.id))
+                    user = result.scalar_one_or_none()
+
+                    if user is None:
+                        # Создаём пользователя с дефолтными настройками
+                        user = Users(
+                            user_id=tg_user.id,
+                            username=tg_user.username,
+                            first_name=tg_user.first_name,
+                            last_name=tg_user.last_name,
+                            news_subscribed=False,
+                            events_subscribed=False,
+                        )
+                        session.add(user)
+                        await session.commit()
+                    # в кэше хранится копия, не привязанная к сессии этого запроса
+                    session.expunge(user)
+                    user_cache.put(user)
+                # время визита и возврат в рассылки (is_active) пишутся пачкой в фоне
+                last_seen.touch(tg_user.id)
             data["user"] = user
             return await handler(event, data)
+        finally:
+            await session.close()
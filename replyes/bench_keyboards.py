@@ -0,0 +1,45 @@
+# bench_keyboards.py
+"""
+Микробенчмарк клавиатур главных меню: построение с нуля (как раньше
+на каждый показ) против готового объекта из реестра `keyboards`.
+
+Использование: python replyes/bench_keyboards.py [число повторов]
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from replyes.menus import (  # noqa: E402
+    keyboards,
+    build_main_menu_kb,
+    build_category_menu,
+    build_services_keyboard,
+    build_rent_menu_keyboard,
+    build_subscriptions_kb,
+)
+
+# (название, построение с нуля, ключ в реестре)
+CASES = [
+    ("главное меню (пользователь)", lambda: build_main_menu_kb(False), ("main_menu", False)),
+    ("главное меню (админ)", lambda: build_main_menu_kb(True), ("main_menu", True)),
+    ("типы мероприятий", build_category_menu, ("events_category",)),
+    ("услуги", build_services_keyboard, ("services",)),
+    ("аренда", build_rent_menu_keyboard, ("rent_menu",)),
+    ("подписки", lambda: build_subscriptions_kb(True, False), ("subscriptions", True, False)),
+]
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    keyboards.warm_up()
+
+    print(f"{'клавиатура':<30}{'с нуля, мкс':>14}{'реестр, мкс':>14}{'выигрыш':>10}")
+    for title, build, key in CASES:
+        built = min(timeit.repeat(build, number=number, repeat=3)) / number * 1e6
+        cached = min(timeit.repeat(lambda: keyboards.get(*key), number=number, repeat=3)) / number * 1e6
+        print(f"{title:<30}{built:>14.2f}{cached:>14.3f}{built / cached:>9.0f}×")
+
+
+if __name__ == "__main__":
+    main()
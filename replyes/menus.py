@@ -0,0 +1,104 @@
+"""
+Построители клавиатур главных меню. Регистрируются в `keyboards`;
+хендлеры берут готовые объекты через `keyboards.get(...)`.
+"""
+
+from itertools import product
+
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+from replyes.registry import keyboards
+
+
+# ---------- Главное меню ----------
+@keyboards.register("main_menu", variants=(False, True))
+def build_main_menu_kb(is_staff: bool) -> InlineKeyboardMarkup:
+    """is_staff — суперадмин или редактор: добавляется вход в админку."""
+    buttons = [
+        [
+            InlineKeyboardButton(text="📆 Афиша мероприятий", callback_data="events"),
+            InlineKeyboardButton(text="💃 Студии", callback_data="studios"),
+        ],
+        [
+            InlineKeyboardButton(text="🗞 Новости", callback_data="list_news"),
+            InlineKeyboardButton(text="🖍 Подписки", callback_data="notifications_"),
+        ],
+        [
+            InlineKeyboardButton(text="💼 Услуги", callback_data="services"),
+            InlineKeyboardButton(text="📍 Контакты", callback_data="contacts"),
+        ],
+        [InlineKeyboardButton(text="Верификация участника кружков", url="http://uslugi.mosreg.ru")],
+        [InlineKeyboardButton(text="💬 Помощь", callback_data="help")],
+    ]
+    if is_staff:
+        buttons.append([InlineKeyboardButton(text="🛠 Панель администратора", callback_data="admin_panel")])
+
+    return InlineKeyboardMarkup(inline_keyboard=buttons)
+
+
+# ---------- Афиша ----------
+@keyboards.register("events_category")
+def build_category_menu() -> InlineKeyboardMarkup:
+    """Меню выбора: бесплатные или платные события"""
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(text="🆓 Бесплатные", callback_data="events_free:1")],
+        [InlineKeyboardButton(text="💳 Платные", callback_data="events_paid:1")],
+        [InlineKeyboardButton(text="🏠 В Главное меню", callback_data="main_menu")]
+    ])
+
+
+# ---------- Услуги ----------
+@keyboards.register("services")
+def build_services_keyboard() -> InlineKeyboardMarkup:
+    """Главное меню услуг"""
+    buttons = [
+        [InlineKeyboardButton(text="Верификация участника кружков", url="http://uslugi.mosreg.ru")],
+        [InlineKeyboardButton(text="Аренда помещений", callback_data="rent_menu")],
+        [InlineKeyboardButton(
+            text="Обратная связь",
+            url="https://forms.mkrf.ru/e/2579/xTPLeBU7/?ap_orgcode=640160132"
+        )],
+        [InlineKeyboardButton(text="Расписание студий (кружков)", url="https://дк-яуза.рф/upload/rasp.docx")],
+        [InlineKeyboardButton(text="🏠 В Главное меню", callback_data="main_menu")]
+    ]
+    return InlineKeyboardMarkup(inline_keyboard=buttons)
+
+
+@keyboards.register("rent_menu")
+def build_rent_menu_keyboard() -> InlineKeyboardMarkup:
+    """
+    Меню аренды помещений. id сообщения в callback_data не передаётся:
+    хендлер зала берёт его из callback.message.
+    """
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(text="Большой зал", callback_data="big_hall")],
+        [InlineKeyboardButton(text="Малый зал", callback_data="small_hall")],
+        [InlineKeyboardButton(text="Бальный зал", callback_data="dance_hall")],
+        [InlineKeyboardButton(
+            text="Аренда помещений (прайс)",
+            url="https://дк-яуза.рф/upload/iblock/d14/6tpgb3m5717z0eaxa0ghbx386zvtgnut.pdf"
+        )],
+        [InlineKeyboardButton(text="Ссылка на сайт", url="https://дк-яуза.рф/prostranstva/")],
+        [InlineKeyboardButton(text="🔙 Назад", callback_data="services")],
+    ])
+
+
+# ---------- Подписки ----------
+@keyboards.register("subscriptions", variants=product((False, True), repeat=2))
+def build_subscriptions_kb(news_subscribed: bool, events_subscribed: bool) -> InlineKeyboardMarkup:
+    buttons = []
+
+    # Новости
+    if news_subscribed:
+        buttons.append([InlineKeyboardButton(text="✅ Вы подписаны на новости", callback_data="unsub_news")])
+    else:
+        buttons.append([InlineKeyboardButton(text="❌ Вы не подписаны на новости", callback_data="sub_news")])
+
+    # Мероприятия
+    if events_subscribed:
+        buttons.append([InlineKeyboardButton(text="✅ Вы подписаны на афишу", callback_data="unsub_events")])
+    else:
+        buttons.append([InlineKeyboardButton(text="❌ Вы не подписаны на афишу", callback_data="sub_events")])
+
+    buttons.append([InlineKeyboardButton(text="🏠 В Главное меню", callback_data='main_menu')])
+    return InlineKeyboardMarkup(inline_keyboard=buttons)
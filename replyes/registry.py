@@ -0,0 +1,70 @@
+"""
+Готовые inline-клавиатуры для часто открываемых меню.
+
+Клавиатура строится и проходит валидацию pydantic один раз на вариант
+(роль, состояние подписок и т.п.), дальше каждый показ отдаёт один и тот же
+объект. Все зарегистрированные варианты собираются при старте (`warm_up`).
+Разметка заморожена: присвоение полей вызывает ошибку, поэтому общий
+объект нельзя случайно испортить в одном из хендлеров.
+"""
+
+import logging
+from typing import Callable, Hashable, Iterable
+
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+from pydantic import ConfigDict
+
+
+# ================== ЛОГИРОВАНИЕ ==================
+
+logger = logging.getLogger(__name__)
+
+
+class FrozenInlineKeyboardButton(InlineKeyboardButton):
+    model_config = ConfigDict(frozen=True)
+
+
+class FrozenInlineKeyboardMarkup(InlineKeyboardMarkup):
+    model_config = ConfigDict(frozen=True)
+
+
+def freeze(markup: InlineKeyboardMarkup) -> FrozenInlineKeyboardMarkup:
+    return FrozenInlineKeyboardMarkup(inline_keyboard=[
+        [FrozenInlineKeyboardButton(**button.model_dump(exclude_none=True)) for button in row]
+        for row in markup.inline_keyboard
+    ])
+
+
+class KeyboardRegistry:
+    def __init__(self) -> None:
+        self._builders: dict[str, tuple[Callable[..., InlineKeyboardMarkup], tuple]] = {}
+        self._markups: dict[tuple, FrozenInlineKeyboardMarkup] = {}
+
+    def register(self, name: str, variants: Iterable[Hashable] = ((),)):
+        """
+        Декоратор: builder(*variant) строит клавиатуру `name`.
+        variants — все варианты аргументов (кортежи; одиночное значение — вариант из одного аргумента).
+        """
+        def decorator(builder: Callable[..., InlineKeyboardMarkup]):
+            self._builders[name] = (builder, tuple(v if isinstance(v, tuple) else (v,) for v in variants))
+            return builder
+        return decorator
+
+    def get(self, name: str, *variant: Hashable) -> FrozenInlineKeyboardMarkup:
+        key = (name, *variant)
+        markup = self._markups.get(key)
+        if markup is None:
+            builder, _ = self._builders[name]
+            markup = self._markups[key] = freeze(builder(*variant))
+        return markup
+
+    def warm_up(self) -> int:
+        """Построить все зарегистрированные варианты; вернуть их число."""
+        for name, (_, variants) in self._builders.items():
+            for variant in variants:
+                self.get(name, *variant)
+        logger.debug(f"Собрано клавиатур: {len(self._markups)}")
+        return len(self._markups)
+
+
+keyboards = KeyboardRegistry()